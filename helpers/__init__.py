@@ -0,0 +1,122 @@
+"""Helper modules for SWOT DCIF Engine."""
+
+from .admission import AdmissionController, ClientDisconnected, Overloaded, cancel_on_disconnect
+from .bulk_import import import_jsonl, iter_import_runs
+from .cache import SharedCache, notify_store_changed, run_file_version, store_generation, store_lock
+from .columnar import ItemTable
+from .compaction import compact_layer_input, count_tokens, warm_tokenizer
+from .dedup import find_near_duplicate, index_layer_inputs, layer_fingerprint_text, rebuild_near_dup_index
+from .drafts import DraftExtractor, draft_key, session_secret, sign_session, verify_session
+from .export import EXPORT_FORMATS, iter_export_runs, ndjson_stream, parquet_available, parquet_stream
+from .llm import ModelRouter, aprompt_layer_to_json, prompt_layer_to_json, validate_layer_output
+from .models import LayerOutput, RunSummary, SWOTItem
+from .pdf_report import (
+    PDF_TEMPLATE_VERSION,
+    cached_report,
+    invalidate_report,
+    pdf_available,
+    render_pdf,
+    render_report_file,
+    report_path,
+)
+from .persistence import (
+    PendingReplacements,
+    apply_replacements,
+    is_valid_run_id,
+    iter_run_paths,
+    load_run,
+    load_run_cached,
+    persist_run,
+    persist_runs,
+    run_id_slug,
+)
+from .rescoring import RescoreInProgress, rescore_running, rescore_runs, reserve_rescore
+from .rollups import company_trend, rebuild_rollups, update_company_rollup
+from .scoring import (
+    DIMENSIONS,
+    LAYERS,
+    SCORING_MODELS,
+    SCORING_VERSION,
+    compute_priorities,
+    get_scorer,
+    register_scoring_model,
+    sensitivity_analysis,
+)
+from .search import index_run, rebuild_search_index, search_items
+from .templates import FORM_HTML, generate_results_html, generate_visualization_html
+
+__all__ = [
+    "AdmissionController",
+    "ClientDisconnected",
+    "DIMENSIONS",
+    "DraftExtractor",
+    "EXPORT_FORMATS",
+    "FORM_HTML",
+    "ItemTable",
+    "LAYERS",
+    "LayerOutput",
+    "ModelRouter",
+    "PDF_TEMPLATE_VERSION",
+    "Overloaded",
+    "PendingReplacements",
+    "RescoreInProgress",
+    "RunSummary",
+    "SCORING_MODELS",
+    "SCORING_VERSION",
+    "SharedCache",
+    "SWOTItem",
+    "apply_replacements",
+    "aprompt_layer_to_json",
+    "cancel_on_disconnect",
+    "cached_report",
+    "compact_layer_input",
+    "company_trend",
+    "compute_priorities",
+    "count_tokens",
+    "draft_key",
+    "find_near_duplicate",
+    "generate_results_html",
+    "generate_visualization_html",
+    "get_scorer",
+    "import_jsonl",
+    "index_layer_inputs",
+    "index_run",
+    "invalidate_report",
+    "is_valid_run_id",
+    "iter_export_runs",
+    "iter_import_runs",
+    "iter_run_paths",
+    "layer_fingerprint_text",
+    "load_run",
+    "load_run_cached",
+    "ndjson_stream",
+    "notify_store_changed",
+    "parquet_available",
+    "parquet_stream",
+    "pdf_available",
+    "persist_run",
+    "persist_runs",
+    "prompt_layer_to_json",
+    "rebuild_near_dup_index",
+    "rebuild_rollups",
+    "rebuild_search_index",
+    "register_scoring_model",
+    "render_pdf",
+    "render_report_file",
+    "report_path",
+    "rescore_running",
+    "rescore_runs",
+    "reserve_rescore",
+    "run_file_version",
+    "run_id_slug",
+    "search_items",
+    "session_secret",
+    "sensitivity_analysis",
+    "sign_session",
+    "store_generation",
+    "store_lock",
+    "update_company_rollup",
+    "validate_layer_output",
+    "verify_session",
+    "warm_tokenizer",
+]
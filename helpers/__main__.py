@@ -0,0 +1,72 @@
+"""Maintenance commands for the run store: `python -m helpers <command>`."""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from .bulk_import import import_jsonl
+from .cache import notify_store_changed, store_lock
+from .dedup import rebuild_near_dup_index
+from .rescoring import RescoreInProgress, rescore_runs
+from .rollups import rebuild_rollups
+from .scoring import SCORING_VERSION
+from .search import rebuild_search_index
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m helpers", description="SWOT run store maintenance.")
+    parser.add_argument("--data-dir", default="swot_data")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rescore = sub.add_parser("rescore", help="Re-score stored runs without calling the LLM.")
+    rescore.add_argument("--version", default=SCORING_VERSION)
+    rescore.add_argument("--workers", type=int, default=None)
+    rescore.add_argument("--no-promote", action="store_true",
+                         help="Only store under priorities_by_version; leave `priorities` and the index untouched.")
+    rescore.add_argument("--restart", action="store_true",
+                         help="Ignore the journal from a previous pass and re-score every run.")
+
+    importer = sub.add_parser("import", help="Validate, score and persist JSONL layer outputs / run summaries.")
+    importer.add_argument("path", help="JSONL file ('-' for stdin)")
+    importer.add_argument("--batch-size", type=int, default=500)
+    importer.add_argument("--overwrite", action="store_true", help="Re-import runs whose run_id already exists.")
+
+    sub.add_parser("rebuild-rollups", help="Regenerate per-company rollups from the stored runs.")
+    sub.add_parser("rebuild-search", help="Regenerate the full-text search index from the stored runs.")
+    sub.add_parser("rebuild-near-dup", help="Regenerate the near-duplicate input index from the stored runs.")
+
+    args = parser.parse_args()
+    data_dir = Path(args.data_dir)
+
+    if args.command == "rescore":
+        try:
+            stats = rescore_runs(
+                data_dir,
+                csv_file=data_dir / "swot_runs.csv",
+                version=args.version,
+                workers=args.workers,
+                promote=not args.no_promote,
+                resume=not args.restart,
+            )
+        except RescoreInProgress as e:
+            sys.exit(str(e))
+    elif args.command == "import":
+        data_dir.mkdir(exist_ok=True)
+        with (sys.stdin if args.path == "-" else open(args.path, "r", encoding="utf-8")) as f:
+            stats = import_jsonl(f, data_dir, data_dir / "swot_runs.csv",
+                                 batch_size=args.batch_size, skip_existing=not args.overwrite)
+    elif args.command == "rebuild-rollups":
+        with store_lock(data_dir):
+            stats = rebuild_rollups(data_dir)
+        notify_store_changed(data_dir)
+    elif args.command == "rebuild-search":
+        stats = rebuild_search_index(data_dir)
+        notify_store_changed(data_dir)
+    elif args.command == "rebuild-near-dup":
+        stats = rebuild_near_dup_index(data_dir)
+    print(json.dumps(stats))
+
+
+if __name__ == "__main__":
+    main()
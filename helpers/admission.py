@@ -0,0 +1,110 @@
+"""Admission control and backpressure for expensive (LLM-backed) routes."""
+
+import asyncio
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Dict, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class Overloaded(Exception):
+    """Raised when a request is rejected instead of queued; maps to 429/503 + Retry-After."""
+
+    def __init__(self, status_code: int, retry_after: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.detail = detail
+
+
+class ClientDisconnected(Exception):
+    """The client went away; in-flight work was cancelled."""
+
+
+class AdmissionController:
+    """
+    Bounded concurrency with a bounded, time-limited wait queue.
+        - Up to `max_concurrency` requests run at once
+        - Up to `max_queue` more wait for a slot; beyond that → 429 immediately
+        - A queued request that waits longer than `queue_timeout` seconds → 503
+    Retry-After is estimated from a moving average of service time and the current backlog.
+    """
+
+    def __init__(self, max_concurrency: int, max_queue: int, queue_timeout: float):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._sem = asyncio.Semaphore(max_concurrency)
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = {429: 0, 503: 0}
+        self._service_time: Optional[float] = None  # EWMA, seconds
+
+    def retry_after(self) -> int:
+        service = self._service_time or 1.0
+        backlog = (self.waiting + self.active) / self.max_concurrency
+        return max(1, math.ceil(service * max(backlog, 1.0)))
+
+    def _reject(self, status_code: int, detail: str) -> Overloaded:
+        self.rejected[status_code] += 1
+        return Overloaded(status_code, self.retry_after(), detail)
+
+    @asynccontextmanager
+    async def slot(self):
+        # Decide on counters, not the semaphore: callers arriving in the same tick all see
+        # it unlocked before any of them has taken a permit
+        if self.active + self.waiting >= self.max_concurrency + self.max_queue:
+            raise self._reject(429, "Too many analyses queued; try again later.")
+
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._sem.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise self._reject(503, "Timed out waiting for an analysis slot.") from None
+        finally:
+            self.waiting -= 1
+
+        self.active += 1
+        self.admitted += 1
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self._service_time = elapsed if self._service_time is None else 0.8 * self._service_time + 0.2 * elapsed
+            self.active -= 1
+            self._sem.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "queue_timeout": self.queue_timeout,
+            "active": self.active,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "rejected": dict(self.rejected),
+            "avg_service_seconds": round(self._service_time, 3) if self._service_time else None,
+        }
+
+
+async def cancel_on_disconnect(request, work: Awaitable[T], poll_interval: float = 0.5) -> T:
+    """
+    Await `work`, cancelling it (and any LLM calls it is awaiting) if the client disconnects.
+    `request` is a Starlette/FastAPI Request.
+    """
+    task = asyncio.ensure_future(work)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=poll_interval)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                task.cancel()
+                raise ClientDisconnected()
+    finally:
+        if not task.done():
+            task.cancel()
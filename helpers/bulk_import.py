@@ -0,0 +1,192 @@
+"""Bulk import/replay of precomputed layer outputs and run summaries (JSONL)."""
+
+import hashlib
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from .models import LayerOutput, RunSummary
+from .persistence import (
+    PendingReplacements,
+    apply_replacements,
+    is_valid_run_id,
+    persist_runs,
+    run_exists,
+    run_id_slug,
+)
+from .scoring import LAYERS, compute_priorities
+
+IMPORT_BATCH_SIZE = 500
+MAX_REPORTED_ERRORS = 100
+
+
+def _run_id(timestamp: Optional[str], company: str, digest: str) -> str:
+    """
+    Derived from the content only, so replaying the same lines yields the same ids.
+    The timestamp prefix is used only when the lines carry one; the import time never is.
+    """
+    if not timestamp:
+        return f"import_{run_id_slug(company)}_{digest[:16]}"
+    ts = datetime.fromisoformat(timestamp).strftime("%Y%m%dT%H%M%S")
+    return f"{ts}_{run_id_slug(company)}_{digest[:8]}"
+
+
+def _check_run_id(summary: RunSummary) -> RunSummary:
+    if not is_valid_run_id(summary.run_id):
+        raise ValueError(f"Invalid run_id {summary.run_id!r}: use letters, digits, '_', '-' and '.' only")
+    return summary
+
+
+def _empty_layer(layer: str, company: str, desired_outcomes: str) -> LayerOutput:
+    return LayerOutput(layer=layer, company=company, desired_outcomes=desired_outcomes)
+
+
+def _summary_from_layers(group: List[Tuple[Dict[str, Any], LayerOutput]]) -> RunSummary:
+    """Assemble a run from up to three LayerOutput lines; missing layers are left empty."""
+    first_raw, first = group[0]
+    by_layer = {out.layer.lower(): out for _, out in group}
+    unknown = set(by_layer) - set(LAYERS)
+    if unknown:
+        raise ValueError(f"Unknown layer(s): {sorted(unknown)}")
+    layers = {
+        name: by_layer.get(name) or _empty_layer(name.title(), first.company, first.desired_outcomes)
+        for name in LAYERS
+    }
+    digest = hashlib.sha1(
+        json.dumps([raw for raw, _ in group], sort_keys=True).encode("utf-8")
+    ).hexdigest()
+    return RunSummary(
+        run_id=first_raw.get("run_id") or _run_id(first_raw.get("timestamp"), first.company, digest),
+        timestamp=first_raw.get("timestamp") or datetime.now(timezone.utc).isoformat(),
+        company=first.company,
+        desired_outcomes=first.desired_outcomes,
+        priorities={},
+        **layers,
+    )
+
+
+def _group_key(raw: Dict[str, Any]) -> Tuple[str, ...]:
+    if raw.get("run_id"):
+        return ("run_id", raw["run_id"])
+    return ("layers", raw.get("company", ""), raw.get("desired_outcomes", ""), raw.get("timestamp", ""))
+
+
+def iter_import_runs(lines: Iterable[str]) -> Iterator[Tuple[int, Optional[RunSummary], Optional[str]]]:
+    """
+    Parse JSONL into runs, yielding (line number, summary, error).
+        - A line with `canonical`/`corpus`/`transactional` is a whole RunSummary
+        - Otherwise it is a LayerOutput; consecutive lines sharing a run_id (or company,
+          desired_outcomes and timestamp) form one run, with absent layers left empty.
+          A layer that repeats starts the next run (or, under an explicit run_id, is an
+          invalid line), so no line is silently overwritten
+    Every run is (re)scored with compute_priorities; invalid lines yield an error instead.
+    """
+    group: List[Tuple[Dict[str, Any], LayerOutput]] = []
+    group_line = 0
+
+    def flush():
+        try:
+            summary = _check_run_id(_summary_from_layers(group))
+        except (ValueError, ValidationError) as e:
+            return group_line, None, str(e)
+        return group_line, summary, None
+
+    for line_no, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            raw = json.loads(line)
+            if not isinstance(raw, dict):
+                raise ValueError("Each line must be a JSON object.")
+            if "canonical" in raw:
+                if group:
+                    yield flush()
+                    group = []
+                raw.setdefault("priorities", {})
+                yield line_no, _check_run_id(RunSummary(**raw)), None
+                continue
+            layer = LayerOutput(**raw)
+            same_run = bool(group) and _group_key(group[0][0]) == _group_key(raw)
+            repeated = same_run and any(out.layer.lower() == layer.layer.lower() for _, out in group)
+            if repeated and raw.get("run_id"):
+                raise ValueError(f"Layer {layer.layer!r} repeated for run_id {raw['run_id']!r}")
+        except (ValueError, ValidationError) as e:
+            yield line_no, None, str(e)
+            continue
+
+        if group and (repeated or not same_run):
+            yield flush()
+            group = []
+        if not group:
+            group_line = line_no
+        group.append((raw, layer))
+    if group:
+        yield flush()
+
+
+def _score(summary: RunSummary) -> RunSummary:
+    summary.priorities = compute_priorities(summary.canonical, summary.corpus, summary.transactional)
+    summary.scoring_version = summary.priorities["version"]
+    return summary
+
+
+class ImportJob:
+    """
+    Accumulates parsed runs into batches and persists each batch through `persist_runs`.
+    CSV rows and rollups of overwritten runs are fixed up once, by `finish()`.
+    """
+
+    def __init__(self, data_dir: Path, csv_file: Path, batch_size: int = IMPORT_BATCH_SIZE,
+                 skip_existing: bool = True):
+        self.data_dir = data_dir
+        self.csv_file = csv_file
+        self.batch_size = batch_size
+        self.skip_existing = skip_existing
+        self.batch: List[RunSummary] = []
+        self.batch_ids: set = set()
+        self.pending = PendingReplacements()
+        self.stats: Dict[str, Any] = {"imported": 0, "skipped_existing": 0, "invalid": 0, "batches": 0,
+                                      "replaced": 0, "errors": []}
+
+    def add(self, line_no: int, summary: Optional[RunSummary], error: Optional[str]) -> bool:
+        """Queue one parsed result; returns True when a full batch is ready to flush."""
+        if error is not None:
+            self.stats["invalid"] += 1
+            if len(self.stats["errors"]) < MAX_REPORTED_ERRORS:
+                self.stats["errors"].append({"line": line_no, "error": error[:500]})
+            return False
+        if summary.run_id in self.batch_ids or (self.skip_existing and run_exists(summary.run_id, self.data_dir)):
+            self.stats["skipped_existing"] += 1
+            return False
+        self.batch.append(_score(summary))
+        self.batch_ids.add(summary.run_id)
+        return len(self.batch) >= self.batch_size
+
+    def flush(self) -> None:
+        if not self.batch:
+            return
+        persist_runs(self.batch, self.data_dir, self.csv_file, pending=self.pending)
+        self.stats["imported"] += len(self.batch)
+        self.stats["batches"] += 1
+        self.batch = []
+        self.batch_ids = set()
+
+    def finish(self) -> Dict[str, Any]:
+        self.flush()
+        apply_replacements(self.pending, self.data_dir, self.csv_file)
+        self.stats["replaced"] = len(self.pending.rows)
+        return self.stats
+
+
+def import_jsonl(lines: Iterable[str], data_dir: Path, csv_file: Path,
+                 batch_size: int = IMPORT_BATCH_SIZE, skip_existing: bool = True) -> Dict[str, Any]:
+    """Validate, score and persist JSONL records in batches."""
+    job = ImportJob(data_dir, csv_file, batch_size, skip_existing)
+    for parsed in iter_import_runs(lines):
+        if job.add(*parsed):
+            job.flush()
+    return job.finish()
@@ -0,0 +1,241 @@
+"""Cross-process cache and change notifications for multi-worker deployments on one host."""
+
+import json
+import mmap
+import os
+import sqlite3
+import struct
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Type
+
+try:
+    import fcntl
+except ImportError:  # non-POSIX: fall back to in-process locking only
+    fcntl = None
+
+CACHE_DB = "cache.sqlite3"
+GENERATION_FILE = ".generation"
+LOCK_FILE = ".store.lock"
+
+_thread_locks: Dict[str, threading.Lock] = {}
+_thread_locks_guard = threading.Lock()
+
+
+@contextmanager
+def file_lock(path: Path, blocking: bool = True):
+    """
+    Exclusive lock across threads (threading.Lock) and processes (flock) for `path`.
+    With `blocking=False`, raises BlockingIOError instead of waiting when it is held.
+    """
+    with _thread_locks_guard:
+        tlock = _thread_locks.setdefault(str(path), threading.Lock())
+    if not tlock.acquire(blocking=blocking):
+        raise BlockingIOError(f"{path} is locked")
+    try:
+        if fcntl is None:
+            yield
+            return
+        with open(path, "a+b") as f:
+            fcntl.flock(f, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+    finally:
+        tlock.release()
+
+
+def store_lock(data_dir: Path):
+    """Serializes writes to the run store (CSV index, rollups, search and near-dup indexes) across workers."""
+    return file_lock(data_dir / LOCK_FILE)
+
+
+def replace_sqlite(tmp_path: Path, path: Path) -> None:
+    """
+    Swap a freshly built SQLite file in for `path`. Caller holds store_lock, so no writer is
+    mid-transaction; the old file's WAL is checkpointed and truncated first so it can never
+    be replayed onto the new file.
+    """
+    if path.exists():
+        conn = sqlite3.connect(path, timeout=30)
+        try:
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        finally:
+            conn.close()
+    os.replace(tmp_path, path)
+
+
+class StoreGeneration:
+    """
+    A shared 64-bit counter in an mmap'd file, bumped on every store write.
+    Any worker sees a bump immediately, so it doubles as the change notification
+    that invalidates derived caches.
+    """
+
+    def __init__(self, data_dir: Path):
+        self.path = data_dir / GENERATION_FILE
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if os.fstat(fd).st_size < 8:
+                os.ftruncate(fd, 8)
+            self._mm = mmap.mmap(fd, 8)
+        finally:
+            os.close(fd)
+
+    @property
+    def value(self) -> int:
+        return struct.unpack_from("<Q", self._mm, 0)[0]
+
+    def bump(self) -> int:
+        with file_lock(self.path.with_suffix(".lock")):
+            value = self.value + 1
+            struct.pack_into("<Q", self._mm, 0, value)
+        return value
+
+
+_generations: Dict[str, StoreGeneration] = {}
+
+
+def store_generation(data_dir: Path) -> StoreGeneration:
+    """Process-wide StoreGeneration for a data directory."""
+    key = str(data_dir.resolve())
+    if key not in _generations:
+        _generations[key] = StoreGeneration(data_dir)
+    return _generations[key]
+
+
+def notify_store_changed(data_dir: Path) -> int:
+    return store_generation(data_dir).bump()
+
+
+class SharedCache:
+    """
+    Two-level cache shared by all workers on a host.
+        - L1: per-process LRU (no serialization)
+        - L2: SQLite table in the data dir, so a value computed by one worker serves all
+    Every entry carries a caller-supplied `version` (store generation, file mtime, ...);
+    a lookup only hits when the stored version matches, so stale entries are never served.
+    L2 holds JSON only (never pickle, so a tampered cache file cannot run code): values must
+    be JSON-serializable, or instances of `model` (a pydantic model), rebuilt on read.
+    """
+
+    def __init__(
+        self,
+        data_dir: Path,
+        namespace: str,
+        max_local: int = 1024,
+        max_shared: int = 50_000,
+        model: Optional[Type[Any]] = None,
+    ):
+        self.db_path = data_dir / CACHE_DB
+        self.namespace = namespace
+        self.model = model
+        self.max_local = max_local
+        self.max_shared = max_shared
+        self._local: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conns = threading.local()
+        self._writes = 0
+        self.stats = {"l1_hits": 0, "l2_hits": 0, "misses": 0}
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._conns, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "namespace TEXT NOT NULL, key TEXT NOT NULL, version INTEGER NOT NULL, "
+                "value BLOB NOT NULL, created REAL NOT NULL, PRIMARY KEY (namespace, key))"
+            )
+            self._conns.conn = conn
+        return conn
+
+    def _dumps(self, value: Any) -> str:
+        return json.dumps(value.model_dump(mode="json") if self.model is not None else value, ensure_ascii=False)
+
+    def _loads(self, blob: Any) -> Any:
+        value = json.loads(blob)
+        return self.model.model_validate(value) if self.model is not None else value
+
+    def _remember(self, key: str, version: int, value: Any) -> None:
+        with self._lock:
+            self._local[key] = (version, value)
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_local:
+                self._local.popitem(last=False)
+
+    def get(self, key: str, version: int, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is not None and entry[0] == version:
+                self._local.move_to_end(key)
+                self.stats["l1_hits"] += 1
+                return entry[1]
+
+        row = self._conn().execute(
+            "SELECT version, value FROM cache WHERE namespace = ? AND key = ?", (self.namespace, key)
+        ).fetchone()
+        if row is not None and row[0] == version:
+            try:
+                value = self._loads(row[1])
+            except ValueError:  # unreadable (e.g. written by an older, pickle-based version): a miss
+                value = default
+            else:
+                self._remember(key, version, value)
+                self.stats["l2_hits"] += 1
+                return value
+
+        self.stats["misses"] += 1
+        return default
+
+    def set(self, key: str, version: int, value: Any) -> None:
+        self._remember(key, version, value)
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (namespace, key, version, value, created) VALUES (?, ?, ?, ?, ?)",
+                (self.namespace, key, version, self._dumps(value), time.time()),
+            )
+        self._writes += 1
+        if self._writes % 256 == 0:
+            self._prune()
+
+    def _prune(self) -> None:
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "DELETE FROM cache WHERE namespace = ? AND key IN ("
+                "SELECT key FROM cache WHERE namespace = ? ORDER BY created DESC LIMIT -1 OFFSET ?)",
+                (self.namespace, self.namespace, self.max_shared),
+            )
+
+    def get_or_compute(self, key: str, version: int, compute: Callable[[], Any]) -> Any:
+        sentinel = object()
+        value = self.get(key, version, sentinel)
+        if value is sentinel:
+            value = compute()
+            if value is not None:
+                self.set(key, version, value)
+        return value
+
+    def hit_rate(self) -> Optional[float]:
+        total = sum(self.stats.values())
+        return round((self.stats["l1_hits"] + self.stats["l2_hits"]) / total, 4) if total else None
+
+    def report(self) -> Dict[str, Any]:
+        return {"namespace": self.namespace, **self.stats, "hit_rate": self.hit_rate(),
+                "local_entries": len(self._local), "pid": os.getpid()}
+
+
+def run_file_version(run_id: str, data_dir: Path) -> Optional[int]:
+    """mtime_ns of a run file, used as the cache version of that run (None if missing)."""
+    try:
+        return os.stat(data_dir / f"{run_id}.json").st_mtime_ns
+    except FileNotFoundError:
+        return None
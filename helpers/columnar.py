@@ -0,0 +1,222 @@
+"""Compact struct-of-arrays representation of SWOT items for bulk analytics."""
+
+import json
+import sys
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .models import LayerOutput, RunSummary, SWOTItem
+from .scoring import DIMENSIONS, LAYERS, SCORING_MODELS, SCORING_VERSION, compute_priorities
+
+LAYER_CODES = {name: code for code, name in enumerate(LAYERS)}
+DIMENSION_CODES = {name: code for code, name in enumerate(DIMENSIONS)}
+
+# Run-level RunSummary fields that are not items; kept per run as one JSON string
+RUN_FIELDS = ("priorities", "scoring_version", "priorities_by_version", "layer_inputs", "reuse", "compaction", "drafted")
+
+
+class ItemTable:
+    """
+    Every item of many runs as parallel arrays instead of pydantic objects:
+        - run (int32), layer / dimension codes (int8), impact (int8), sentiment (float32)
+        - text (int32) indexing an interned pool, so repeated item texts are stored once
+    Items are grouped by run; `run_offsets[r]:run_offsets[r + 1]` slices run r.
+    Run-level fields (RUN_FIELDS and each layer's run_metadata) are kept as one JSON string
+    per run, so `to_run_summary` round-trips a run; with `run_fields=False` only items are
+    kept (leaner, for analytics) and the converters rebuild items only.
+    Build with `from_runs` / `from_run_files`; the table is read-only afterwards.
+    """
+
+    def __init__(self):
+        self._run = array("i")
+        self._layer = array("b")
+        self._dim = array("b")
+        self._impact = array("b")
+        self._sentiment = array("f")
+        self._text = array("i")
+        self._offsets = array("q", [0])
+        self._text_ids: Optional[Dict[str, int]] = {}
+        self._company_ids: Dict[str, int] = {}
+        self._outcome_ids: Dict[str, int] = {}
+        self._run_company = array("i")
+        self._run_outcomes = array("i")
+
+        self.texts: List[str] = []
+        self.companies: List[str] = []
+        self.outcomes: List[str] = []
+        self.run_ids: List[str] = []
+        self.timestamps: List[str] = []
+        self.run_fields: List[Optional[str]] = []
+
+    # -- construction --------------------------------------------------------
+
+    @staticmethod
+    def _intern(value: str, ids: Dict[str, int], pool: List[str]) -> int:
+        code = ids.get(value)
+        if code is None:
+            code = ids[value] = len(pool)
+            pool.append(value)
+        return code
+
+    def _append(self, summary: RunSummary, run_fields: bool = True) -> None:
+        r = len(self.run_ids)
+        self.run_ids.append(summary.run_id)
+        self.timestamps.append(summary.timestamp)
+        if run_fields:
+            fields = summary.model_dump(mode="json", include=set(RUN_FIELDS))
+            fields["run_metadata"] = {name: getattr(summary, name).run_metadata for name in LAYERS}
+            self.run_fields.append(json.dumps(fields, ensure_ascii=False, separators=(",", ":")))
+        else:
+            self.run_fields.append(None)
+        self._run_company.append(self._intern(summary.company, self._company_ids, self.companies))
+        self._run_outcomes.append(self._intern(summary.desired_outcomes, self._outcome_ids, self.outcomes))
+        for lname, lcode in LAYER_CODES.items():
+            layer = getattr(summary, lname)
+            for dname, dcode in DIMENSION_CODES.items():
+                for item in getattr(layer, dname):
+                    self._run.append(r)
+                    self._layer.append(lcode)
+                    self._dim.append(dcode)
+                    self._impact.append(item.impact)
+                    self._sentiment.append(item.sentiment)
+                    self._text.append(self._intern(item.text, self._text_ids, self.texts))
+        self._offsets.append(len(self._run))
+
+    def _freeze(self) -> "ItemTable":
+        # Zero-copy NumPy views over the compact builders
+        self.run = np.frombuffer(self._run, dtype=np.int32)
+        self.layer = np.frombuffer(self._layer, dtype=np.int8)
+        self.dimension = np.frombuffer(self._dim, dtype=np.int8)
+        self.impact = np.frombuffer(self._impact, dtype=np.int8)
+        self.sentiment = np.frombuffer(self._sentiment, dtype=np.float32)
+        self.text = np.frombuffer(self._text, dtype=np.int32)
+        self.run_offsets = np.frombuffer(self._offsets, dtype=np.int64)
+        self.run_company = np.frombuffer(self._run_company, dtype=np.int32)
+        self.run_outcomes = np.frombuffer(self._run_outcomes, dtype=np.int32)
+        self._text_ids = None  # only needed while building
+        return self
+
+    @classmethod
+    def from_runs(cls, runs: Iterable[RunSummary], run_fields: bool = True) -> "ItemTable":
+        table = cls()
+        for summary in runs:
+            table._append(summary, run_fields)
+        return table._freeze()
+
+    @classmethod
+    def from_run_files(cls, paths: Iterable[Path], run_fields: bool = True) -> "ItemTable":
+        """Build from stored run files, holding only one pydantic run at a time."""
+        def load(path: Path) -> RunSummary:
+            with open(path, "r", encoding="utf-8") as f:
+                return RunSummary(**json.load(f))
+        return cls.from_runs((load(p) for p in paths), run_fields)
+
+    # -- size ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.run)
+
+    @property
+    def num_runs(self) -> int:
+        return len(self.run_ids)
+
+    def memory_report(self) -> Dict[str, Any]:
+        """Bytes held by the arrays, the interned pools and run metadata, and bytes per item."""
+        arrays = sum(a.nbytes for a in (
+            self.run, self.layer, self.dimension, self.impact, self.sentiment, self.text,
+            self.run_offsets, self.run_company, self.run_outcomes,
+        ))
+        strings = lambda pool: sys.getsizeof(pool) + sum(sys.getsizeof(s) for s in pool)  # noqa: E731
+        text_pool = strings(self.texts)
+        metadata = strings(self.run_ids) + strings(self.timestamps) + strings(self.companies) + strings(self.outcomes)
+        fields = strings([f for f in self.run_fields if f is not None])
+        total = arrays + text_pool + metadata + fields
+        n = len(self) or 1
+        return {
+            "items": len(self),
+            "runs": self.num_runs,
+            "unique_texts": len(self.texts),
+            "array_bytes": arrays,
+            "text_pool_bytes": text_pool,
+            "run_metadata_bytes": metadata,
+            "run_fields_bytes": fields,
+            "total_bytes": total,
+            "bytes_per_item": round(total / n, 1),
+            "array_bytes_per_item": round(arrays / n, 1),
+        }
+
+    # -- converters back to pydantic -----------------------------------------
+
+    def _run_fields(self, r: int) -> Optional[Dict[str, Any]]:
+        fields = self.run_fields[r]
+        return json.loads(fields) if fields is not None else None
+
+    def to_layer_output(self, r: int, layer: str) -> LayerOutput:
+        """Rebuild one layer of run r, with its run_metadata when the table kept run fields."""
+        start, end = int(self.run_offsets[r]), int(self.run_offsets[r + 1])
+        fields = self._run_fields(r)
+        out = LayerOutput(
+            layer=layer.title(),
+            company=self.companies[self.run_company[r]],
+            desired_outcomes=self.outcomes[self.run_outcomes[r]],
+            run_metadata=fields["run_metadata"][layer.lower()] if fields else {},
+        )
+        lcode = LAYER_CODES[layer.lower()]
+        for i in range(start, end):
+            if self.layer[i] != lcode:
+                continue
+            getattr(out, DIMENSIONS[self.dimension[i]]).append(SWOTItem(
+                text=self.texts[self.text[i]],
+                impact=int(self.impact[i]),
+                sentiment=round(float(self.sentiment[i]), 6),
+            ))
+        return out
+
+    def to_run_summary(self, r: int, model: Optional[str] = None) -> RunSummary:
+        """
+        Rebuild run r as it was stored. Priorities are recomputed with `model` when one is
+        given, and always for an items-only table (with the default model when none is given).
+        """
+        layers = {name: self.to_layer_output(r, name) for name in LAYERS}
+        fields = self._run_fields(r) or {}
+        fields.pop("run_metadata", None)
+        if model is not None or not fields:
+            model = model or SCORING_VERSION
+            fields["priorities"] = compute_priorities(
+                layers["canonical"], layers["corpus"], layers["transactional"], model=model
+            )
+            fields["scoring_version"] = model
+        return RunSummary(
+            run_id=self.run_ids[r],
+            timestamp=self.timestamps[r],
+            company=self.companies[self.run_company[r]],
+            desired_outcomes=self.outcomes[self.run_outcomes[r]],
+            **fields,
+            **layers,
+        )
+
+    # -- analytics -------------------------------------------------------------
+
+    def layer_means(self):
+        """Per-run average impact and sentiment as (runs, dimension, layer) arrays (0 where empty)."""
+        cells = len(DIMENSIONS) * len(LAYERS)
+        group = self.run.astype(np.int64) * cells + self.dimension * len(LAYERS) + self.layer
+        size = self.num_runs * cells
+        counts = np.bincount(group, minlength=size)
+        safe = np.maximum(counts, 1)
+        impacts = np.bincount(group, weights=self.impact, minlength=size) / safe
+        sentiments = np.bincount(group, weights=self.sentiment, minlength=size) / safe
+        shape = (self.num_runs, len(DIMENSIONS), len(LAYERS))
+        return impacts.reshape(shape), sentiments.reshape(shape)
+
+    def priorities(self, model: str = SCORING_VERSION) -> np.ndarray:
+        """(runs, dimension) priorities from a registered scoring model, all runs in one pass."""
+        impacts, sentiments = self.layer_means()
+        return np.round(SCORING_MODELS[model](impacts, sentiments), 2)
+
+    def texts_matching(self, mask: np.ndarray) -> List[str]:
+        """Unique item texts selected by a boolean mask over items."""
+        return [self.texts[i] for i in np.unique(self.text[mask])]
@@ -0,0 +1,202 @@
+"""Local prompt compaction for layer notes (dedup, noise stripping, token budgets)."""
+
+import re
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Set
+
+from pydantic import BaseModel
+
+# Quadrant order used when rendering seeds
+SEED_DIMENSIONS = ["strengths", "weaknesses", "opportunities", "threats"]
+
+# Share of a token budget kept for the notes when seeds alone would fill it
+NOTES_MIN_SHARE = 0.5
+
+_URL = re.compile(r"(?:https?://|www\.)\S+")
+_EMAIL = re.compile(r"\b[\w.+-]+@[\w-]+\.[\w.-]+\b")
+_HTML_TAG = re.compile(r"</?[a-zA-Z][^>]*>")
+_QUOTE_LINE = re.compile(r"^\s*>")  # e-mail style quoted replies
+_SPACES = re.compile(r"[ \t ]+")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"'(])")
+_CLAUSE_END = re.compile(r"(?<=[;,|])\s+")  # for sentences too long to keep whole
+_WORD = re.compile(r"\w+")
+
+
+@lru_cache(maxsize=1)
+def _tokenizer() -> Callable[[str], int]:
+    """tiktoken when its encoding is available locally, else a ~4 chars/token estimate."""
+    try:
+        import tiktoken
+        encoding = tiktoken.get_encoding("o200k_base")
+        return lambda text: len(encoding.encode(text, disallowed_special=()))
+    except Exception:
+        return lambda text: (len(text) + 3) // 4
+
+
+def count_tokens(text: str) -> int:
+    return _tokenizer()(text) if text else 0
+
+
+def warm_tokenizer() -> None:
+    """Load the tokenizer up front: tiktoken may download its encoding on first use."""
+    _tokenizer()
+
+
+def _key(sentence: str) -> str:
+    """Normalized identity of a sentence for dedup (case, punctuation and spacing ignored)."""
+    return " ".join(_WORD.findall(sentence.lower()))
+
+
+def render_seed(seed: Dict[str, List[str]]) -> str:
+    """Seeds as compact labelled bullet lists (instead of Python list reprs)."""
+    blocks = []
+    for dim in SEED_DIMENSIONS:
+        items = seed.get(dim) or []
+        if items:
+            blocks.append(f"{dim}:\n" + "\n".join(f"- {s}" for s in items))
+    return "\n".join(blocks)
+
+
+class CompactedInput(BaseModel):
+    text: str
+    seed: Dict[str, List[str]]
+    stats: Dict[str, int] = {}
+
+
+def _clean_line(line: str) -> str:
+    line = _HTML_TAG.sub(" ", line)
+    line = _URL.sub("", line)
+    line = _EMAIL.sub("", line)
+    return _SPACES.sub(" ", line).strip(" -*•\t")
+
+
+def _cut_to_tokens(text: str, limit: int) -> str:
+    """Longest run of leading words of `text` within `limit` tokens."""
+    words = text.split()
+    lo, hi = 0, len(words)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if count_tokens(" ".join(words[:mid])) <= limit:
+            lo = mid
+        else:
+            hi = mid - 1
+    return " ".join(words[:lo])
+
+
+def _fit_seed(seed: Dict[str, List[str]], budget: int):
+    """Keep seeds round-robin across quadrants (first items first) while they fit in `budget`."""
+    if count_tokens(render_seed(seed)) <= budget:
+        return seed, 0
+    kept: Dict[str, List[str]] = {dim: [] for dim in SEED_DIMENSIONS}
+    used = 0
+    depth = max((len(items) for items in seed.values()), default=0)
+    for i in range(depth):
+        for dim in SEED_DIMENSIONS:
+            items = seed.get(dim, [])
+            if i >= len(items):
+                continue
+            cost = count_tokens(f"- {items[i]}") + 1 + (0 if kept[dim] else count_tokens(f"{dim}:") + 1)
+            if used + cost <= budget:
+                kept[dim].append(items[i])
+                used += cost
+    dropped = sum(len(items) for items in seed.values()) - sum(len(items) for items in kept.values())
+    return kept, dropped
+
+
+def compact_layer_input(
+    raw_text: str,
+    seed: Optional[Dict[str, List[str]]] = None,
+    token_budget: Optional[int] = None,
+) -> CompactedInput:
+    """
+    Shrink one layer's notes and seeds before they go into the prompt:
+        - drop quoted reply lines, HTML tags, URLs and e-mail addresses
+        - drop repeated sentences (including ones that only repeat a seed)
+        - drop repeated seeds within a quadrant (the same item in two quadrants is the
+          user's own classification and is kept in both)
+        - keep whole sentences, in order, until `token_budget` is reached; the sentence
+          that crosses it is kept clause by clause and cut at the budget, so notes that are
+          one long line (a pasted review dump) never compact to nothing
+    Seeds count against the budget first, but when there are notes they may use at most
+    (1 - NOTES_MIN_SHARE) of it; beyond that seeds are dropped round-robin from the end
+    of each quadrant.
+    Returns the compacted text and seeds plus before/after token counts.
+    """
+    seed = seed or {}
+    tokens_before = count_tokens(raw_text) + count_tokens(str(seed) if any(seed.values()) else "")
+
+    compact_seed: Dict[str, List[str]] = {}
+    for dim in SEED_DIMENSIONS:
+        kept = []
+        in_quadrant: Set[str] = set()
+        for item in seed.get(dim, []):
+            item = _clean_line(item)
+            k = _key(item)
+            if k and k not in in_quadrant:
+                in_quadrant.add(k)
+                kept.append(item)
+        compact_seed[dim] = kept
+
+    seeds_dropped = 0
+    budget = None
+    if token_budget is not None:
+        seed_budget = token_budget
+        if raw_text.strip():
+            seed_budget = int(token_budget * (1 - NOTES_MIN_SHARE))
+        compact_seed, seeds_dropped = _fit_seed(compact_seed, seed_budget)
+        budget = token_budget - count_tokens(render_seed(compact_seed))
+    # Only seeds that made it into the prompt make a repeating note sentence redundant
+    seen: Set[str] = {_key(item) for items in compact_seed.values() for item in items}
+
+    lines: List[str] = []
+    used = 0
+    dropped_duplicates = 0
+    truncated = False
+    for raw_line in raw_text.splitlines():
+        if truncated:
+            break
+        if _QUOTE_LINE.match(raw_line):
+            continue
+        kept = []
+        for sentence in _SENTENCE_END.split(_clean_line(raw_line)):
+            k = _key(sentence)
+            if not k:
+                continue
+            if k in seen:
+                dropped_duplicates += 1
+                continue
+            seen.add(k)
+            cost = count_tokens(sentence) + 1
+            if budget is None or used + cost <= budget:
+                kept.append(sentence)
+                used += cost
+                continue
+            truncated = True
+            for clause in _CLAUSE_END.split(sentence):
+                cost = count_tokens(clause) + 1
+                if used + cost > budget:
+                    cut = _cut_to_tokens(clause, budget - used - 1)
+                    if not cut and not (lines or kept):
+                        cut = clause.split()[0]  # at least one word of non-empty notes
+                    if cut:
+                        kept.append(cut)
+                    break
+                kept.append(clause)
+                used += cost
+            break
+        if kept:
+            lines.append(" ".join(kept))
+
+    text = "\n".join(lines)
+    tokens_after = count_tokens(text) + count_tokens(render_seed(compact_seed))
+    return CompactedInput(
+        text=text,
+        seed=compact_seed,
+        stats={
+            "tokens_before": tokens_before,
+            "tokens_after": tokens_after,
+            "duplicates_dropped": dropped_duplicates,
+            "truncated": int(truncated or seeds_dropped > 0),
+            "seeds_dropped": seeds_dropped,
+        },
+    )
@@ -0,0 +1,220 @@
+"""Near-duplicate detection of layer inputs (MinHash + LSH) to reuse prior extractions."""
+
+import hashlib
+import json
+import re
+import sqlite3
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .cache import replace_sqlite, store_lock
+from .models import RunSummary
+from .rollups import company_key
+from .scoring import LAYERS
+
+DEDUP_DB = "near_dup.sqlite3"
+
+NUM_PERM = 128
+BANDS = 32  # 32 bands × 4 rows: candidate pairs from roughly 0.4 Jaccard upward
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+
+_PRIME = (1 << 31) - 1
+_rng = np.random.default_rng(20240601)  # fixed so signatures are comparable across processes
+_PERM_A = _rng.integers(1, _PRIME, NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.integers(0, _PRIME, NUM_PERM, dtype=np.uint64)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS signatures (
+    run_id TEXT NOT NULL,
+    layer TEXT NOT NULL,
+    company TEXT NOT NULL,
+    sig BLOB NOT NULL,
+    PRIMARY KEY (run_id, layer)
+);
+CREATE TABLE IF NOT EXISTS buckets (
+    layer TEXT NOT NULL,
+    band INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    run_id TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS buckets_lookup ON buckets (layer, band, bucket);
+"""
+
+_URL = re.compile(r"https?://\S+")
+_BULLET = re.compile(r"^\s*(?:[-*•]+|\d+[.)])\s*", re.MULTILINE)
+_WORD = re.compile(r"\w+")
+_SENTENCE = re.compile(r"[\n.!?;]+(?:\s+|$)|\n")
+
+
+def layer_fingerprint_text(desired_outcomes: str, notes: str, seed: Optional[Dict[str, List[str]]] = None) -> str:
+    """Everything that shapes a layer extraction, as one document to fingerprint."""
+    parts = [desired_outcomes, notes]
+    for dim, items in sorted((seed or {}).items()):
+        parts.extend(f"{dim}: {s}" for s in items)
+    return "\n".join(parts)
+
+
+def normalize(text: str) -> List[List[str]]:
+    """Sentences as lowercased word tokens, with URLs and bullet markers dropped."""
+    text = _BULLET.sub("", _URL.sub(" ", text))
+    sentences = (_WORD.findall(s.lower()) for s in _SENTENCE.split(text))
+    return [words for words in sentences if words]
+
+
+def _shingles(text: str) -> set:
+    """Word shingles taken within sentences, so reordered bullets keep the same set."""
+    shingles = set()
+    for words in normalize(text):
+        if len(words) <= SHINGLE_SIZE:
+            shingles.add(" ".join(words))
+        else:
+            shingles.update(" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1))
+    return shingles or {""}
+
+
+def minhash_signature(text: str) -> np.ndarray:
+    """MinHash signature over word shingles of the normalized text."""
+    shingles = _shingles(text)
+    hashes = np.fromiter(
+        (zlib.crc32(s.encode("utf-8")) & _PRIME for s in shingles), dtype=np.uint64, count=len(shingles)
+    )
+    # (a·x + b) mod p stays below 2^62, so uint64 never overflows
+    return ((np.outer(hashes, _PERM_A) + _PERM_B) % _PRIME).min(axis=0)
+
+
+def _band_hashes(sig: np.ndarray) -> List[int]:
+    return [
+        int.from_bytes(hashlib.blake2b(sig[b * ROWS:(b + 1) * ROWS].tobytes(), digest_size=8).digest(), "big", signed=True)
+        for b in range(BANDS)
+    ]
+
+
+def _connect(data_dir: Path, name: str = DEDUP_DB) -> sqlite3.Connection:
+    conn = sqlite3.connect(data_dir / name, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _delete_run(conn: sqlite3.Connection, run_id: str) -> None:
+    """Remove a run's signatures and bucket entries (buckets found via the stored signatures)."""
+    for layer, blob in conn.execute("SELECT layer, sig FROM signatures WHERE run_id = ?", (run_id,)).fetchall():
+        conn.executemany(
+            "DELETE FROM buckets WHERE layer = ? AND band = ? AND bucket = ? AND run_id = ?",
+            [(layer, b, h, run_id) for b, h in enumerate(_band_hashes(np.frombuffer(blob, dtype=np.uint64)))],
+        )
+    conn.execute("DELETE FROM signatures WHERE run_id = ?", (run_id,))
+
+
+def _insert_run(conn: sqlite3.Connection, summary: RunSummary) -> None:
+    """(Re)index one run's layer inputs, replacing anything indexed under its run_id."""
+    _delete_run(conn, summary.run_id)
+    company = company_key(summary.company)
+    for layer in LAYERS:
+        text = summary.layer_inputs.get(layer)
+        if not text:
+            continue
+        sig = minhash_signature(text)
+        conn.execute(
+            "INSERT INTO signatures (run_id, layer, company, sig) VALUES (?, ?, ?, ?)",
+            (summary.run_id, layer, company, sig.tobytes()),
+        )
+        conn.executemany(
+            "INSERT INTO buckets (layer, band, bucket, run_id) VALUES (?, ?, ?, ?)",
+            [(layer, b, h, summary.run_id) for b, h in enumerate(_band_hashes(sig))],
+        )
+
+
+def index_runs_layer_inputs(summaries: List[RunSummary], data_dir: Path) -> None:
+    """Index persisted runs' layer inputs (replacing earlier versions) in one transaction."""
+    conn = _connect(data_dir)
+    try:
+        with conn:
+            for summary in summaries:
+                _insert_run(conn, summary)
+    finally:
+        conn.close()
+
+
+def index_layer_inputs(summary: RunSummary, data_dir: Path) -> None:
+    """Add a newly persisted run's layer inputs to the near-duplicate index."""
+    index_runs_layer_inputs([summary], data_dir)
+
+
+def find_near_duplicate(
+    layer: str,
+    company: str,
+    text: str,
+    data_dir: Path,
+    threshold: float,
+) -> Optional[Tuple[str, float]]:
+    """
+    Most similar prior input for this company and layer, as (run_id, estimated Jaccard),
+    or None if nothing reaches `threshold`.
+    """
+    if not text or not (data_dir / DEDUP_DB).exists():
+        return None
+    sig = minhash_signature(text)
+    bands = _band_hashes(sig)
+
+    conn = _connect(data_dir)
+    try:
+        candidates = conn.execute(
+            "SELECT DISTINCT s.run_id, s.sig FROM buckets b "
+            "JOIN signatures s ON s.run_id = b.run_id AND s.layer = b.layer "
+            "WHERE b.layer = ? AND s.company = ? AND ("
+            + " OR ".join("(b.band = ? AND b.bucket = ?)" for _ in bands) + ")",
+            [layer, company_key(company)] + [v for pair in enumerate(bands) for v in pair],
+        ).fetchall()
+    finally:
+        conn.close()
+
+    best: Optional[Tuple[str, float]] = None
+    for run_id, blob in candidates:
+        similarity = float((np.frombuffer(blob, dtype=np.uint64) == sig).mean())
+        if similarity >= threshold and (best is None or (similarity, run_id) > (best[1], best[0])):
+            best = (run_id, round(similarity, 4))
+    return best
+
+
+def rebuild_near_dup_index(data_dir: Path, batch_size: int = 500) -> Dict[str, Any]:
+    """
+    Regenerate the near-duplicate index from the stored runs into a temp file, then swap it
+    in under store_lock. Runs written during the build are re-indexed first; the live index
+    keeps serving (and taking writes) until the swap.
+    """
+    from .persistence import iter_run_paths
+
+    tmp_name = DEDUP_DB + ".rebuild"
+    for suffix in ("", "-wal", "-shm"):
+        (data_dir / (tmp_name + suffix)).unlink(missing_ok=True)
+    started = time.time()
+    conn = _connect(data_dir, tmp_name)
+    runs = 0
+    try:
+        for path in iter_run_paths(data_dir):
+            with open(path, "r", encoding="utf-8") as f:
+                _insert_run(conn, RunSummary(**json.load(f)))
+            runs += 1
+            if runs % batch_size == 0:
+                conn.commit()
+        conn.commit()
+        with store_lock(data_dir):
+            runs = 0
+            for path in iter_run_paths(data_dir):
+                runs += 1
+                if path.stat().st_mtime >= started - 1:
+                    with open(path, "r", encoding="utf-8") as f:
+                        _insert_run(conn, RunSummary(**json.load(f)))
+            conn.commit()
+            signatures = conn.execute("SELECT count(*) FROM signatures").fetchone()[0]
+            conn.close()
+            replace_sqlite(data_dir / tmp_name, data_dir / DEDUP_DB)
+    finally:
+        conn.close()
+    return {"runs": runs, "signatures": signatures}
@@ -0,0 +1,197 @@
+"""Speculative layer extraction while the form is still being edited."""
+
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+from .cache import SharedCache
+from .models import LayerOutput
+
+
+def draft_key(layer: str, company: str, desired_outcomes: str, text: str, seed: Optional[Dict[str, Any]], model: str) -> str:
+    """Hash of exactly what goes into the layer prompt, so a draft only matches an identical request."""
+    payload = json.dumps(
+        [layer.lower(), company.strip(), desired_outcomes.strip(), text, seed or {}, model],
+        sort_keys=True, ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+SECRET_FILE = ".session_secret"
+
+
+def session_secret(data_dir: Path) -> bytes:
+    """SESSION_SECRET, else a random secret created once in the data dir and shared by all workers."""
+    env = os.getenv("SESSION_SECRET")
+    if env:
+        return env.encode("utf-8")
+    path = data_dir / SECRET_FILE
+    if not path.exists():
+        # Written in full to a temp file, then linked into place: a worker starting at the same
+        # time either loses the link or reads the complete secret, never an empty file
+        tmp_path = path.with_name(f"{SECRET_FILE}.{os.getpid()}.{threading.get_ident()}.tmp")
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(secrets.token_hex(32).encode("ascii"))
+            os.link(tmp_path, path)
+        except FileExistsError:
+            pass
+        finally:
+            tmp_path.unlink(missing_ok=True)
+    secret = path.read_bytes().strip()
+    if not secret:
+        raise ValueError(f"{path} is empty: delete it or set SESSION_SECRET")
+    return secret
+
+
+def sign_session(token: str, secret: bytes) -> str:
+    return f"{token}.{hmac.new(secret, token.encode('utf-8'), hashlib.sha256).hexdigest()[:32]}"
+
+
+def verify_session(value: str, secret: bytes) -> Optional[str]:
+    """The session token of a signed cookie value, None when missing or forged."""
+    token, _, _ = (value or "").partition(".")
+    if token and hmac.compare_digest(sign_session(token, secret), value):
+        return token
+    return None
+
+
+class DraftExtractor:
+    """
+    Background per-layer extractions started from the form before submit.
+        - One slot per (session, layer): a new draft for different text cancels the previous one
+        - Spend caps per `window` seconds: `max_per_session` LLM calls per session,
+          `max_per_client` per client address and `max_total` overall (per worker)
+        - At most `max_concurrency` drafts run at once per worker
+        - Finished results are parked for `ttl` seconds, in `shared` too when given, so
+          /analyze on another worker can pick them up
+    """
+
+    def __init__(
+        self,
+        ttl: float = 300.0,
+        max_per_session: int = 20,
+        max_per_client: int = 60,
+        max_total: int = 500,
+        window: float = 3600.0,
+        max_concurrency: int = 4,
+        shared: Optional[SharedCache] = None,
+    ):
+        self.ttl = ttl
+        self.max_per_session = max_per_session
+        self.max_per_client = max_per_client
+        self.max_total = max_total
+        self.window = window
+        self.shared = shared
+        self._sem = asyncio.Semaphore(max_concurrency)
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._slots: Dict[Tuple[str, str], str] = {}
+        self._results: Dict[str, Tuple[float, LayerOutput]] = {}
+        self._claimed: Dict[str, int] = {}  # key -> analyses waiting on it; never cancelled
+        self._spend: Dict[str, Deque[float]] = {}  # "session:…", "client:…", "total" -> call times
+        self.counters = {"started": 0, "cancelled": 0, "capped": 0, "failed": 0, "hits": 0, "misses": 0}
+
+    def _prune(self, now: float) -> None:
+        for key in [k for k, (expires, _) in self._results.items() if expires <= now]:
+            del self._results[key]
+        for slot in [s for s, key in self._slots.items() if key not in self._tasks and key not in self._results]:
+            del self._slots[slot]
+        for bucket in [b for b, calls in self._spend.items() if not calls or calls[-1] <= now - self.window]:
+            del self._spend[bucket]
+
+    def _within_budget(self, bucket: str, limit: int, now: float) -> bool:
+        calls = self._spend.setdefault(bucket, deque())
+        while calls and calls[0] <= now - self.window:
+            calls.popleft()
+        return len(calls) < limit
+
+    def _lookup(self, key: str) -> Optional[LayerOutput]:
+        now = time.time()
+        parked = self._results.get(key)
+        if parked and parked[0] > now:
+            return parked[1]
+        if self.shared is not None:
+            value = self.shared.get(key, 0)
+            if value and value[0] > now:
+                return LayerOutput(**value[1])
+        return None
+
+    def submit(
+        self, session: str, client: str, layer: str, key: str, extract: Callable[[], Awaitable[LayerOutput]]
+    ) -> str:
+        """Start (or keep) the draft for this session's layer. Returns a status string for the client."""
+        now = time.time()
+        self._prune(now)
+        slot = (session, layer.lower())
+
+        previous = self._slots.get(slot)
+        self._slots[slot] = key
+        if previous is not None and previous != key and previous not in self._claimed:
+            stale = self._tasks.get(previous)
+            if stale is not None and not stale.done():
+                stale.cancel()
+                self.counters["cancelled"] += 1
+
+        if key in self._tasks:
+            return "running"
+        if self._lookup(key) is not None:
+            return "ready"
+        buckets = [(f"session:{session}", self.max_per_session), (f"client:{client}", self.max_per_client),
+                   ("total", self.max_total)]
+        if not all(self._within_budget(bucket, limit, now) for bucket, limit in buckets):
+            self.counters["capped"] += 1
+            return "capped"
+
+        for bucket, _ in buckets:
+            self._spend[bucket].append(now)
+        self.counters["started"] += 1
+        task = asyncio.get_running_loop().create_task(self._run(key, extract))
+        self._tasks[key] = task
+        task.add_done_callback(lambda _: self._tasks.pop(key, None))
+        return "started"
+
+    async def _run(self, key: str, extract: Callable[[], Awaitable[LayerOutput]]) -> Optional[LayerOutput]:
+        async with self._sem:
+            try:
+                out = await extract()
+            except Exception as exc:  # the real submit will retry this layer
+                self.counters["failed"] += 1
+                print(f"[drafts] extraction failed: {exc}")
+                return None
+        expires = time.time() + self.ttl
+        self._results[key] = (expires, out)
+        if self.shared is not None:
+            self.shared.set(key, 0, [expires, out.model_dump(mode="json")])
+        return out
+
+    async def take(self, key: str) -> Optional[LayerOutput]:
+        """
+        The drafted output for `key`: waits for an in-flight draft, None when there is none.
+        Shielded, so a cancelled analysis leaves the draft running for the next submit.
+        """
+        task = self._tasks.get(key)
+        if task is None:
+            out = self._lookup(key)
+        else:
+            self._claimed[key] = self._claimed.get(key, 0) + 1
+            try:
+                out = await asyncio.shield(task)
+            finally:
+                self._claimed[key] -= 1
+                if not self._claimed[key]:
+                    del self._claimed[key]
+        self.counters["hits" if out is not None else "misses"] += 1
+        return out.model_copy(deep=True) if out is not None else None
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.counters, "in_flight": len(self._tasks), "parked": len(self._results),
+                "sessions": sum(b.startswith("session:") for b in self._spend)}
@@ -0,0 +1,142 @@
+"""Streaming bulk export of stored runs (NDJSON / Parquet) with resumable cursors."""
+
+import csv
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .persistence import load_run
+from .scoring import DIMENSIONS
+
+EXPORT_FORMATS = ("ndjson", "parquet")
+ROW_GROUP_SIZE = 1000  # runs per Parquet row group
+
+
+def iter_export_runs(
+    data_dir: Path,
+    csv_file: Path,
+    since: Optional[str] = None,
+    cursor: int = 0,
+    limit: Optional[int] = None,
+) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Yield (cursor, run dict) in index (persist) order, one run file at a time.
+    The cursor is the number of index rows consumed; pass it back to resume after that run.
+    `since` keeps runs whose ISO timestamp is >= since.
+    """
+    if not csv_file.exists():
+        return
+    emitted = 0
+    with open(csv_file, "r", encoding="utf-8", newline="") as f:
+        for position, row in enumerate(csv.DictReader(f), start=1):
+            if position <= cursor:
+                continue
+            if since and row["timestamp"] < since:
+                continue
+            run = load_run(row["run_id"], data_dir)
+            if run is None:
+                continue  # indexed but since removed
+            yield position, run.model_dump()
+            emitted += 1
+            if limit is not None and emitted >= limit:
+                return
+
+
+def ndjson_stream(records: Iterator[Tuple[int, Dict[str, Any]]]) -> Iterator[bytes]:
+    """One JSON object per line; `_cursor` on each line resumes after it."""
+    for position, run in records:
+        yield (json.dumps({"_cursor": position, **run}) + "\n").encode("utf-8")
+
+
+def _flatten(position: int, run: Dict[str, Any]) -> Dict[str, Any]:
+    """BI-friendly row: scalar columns plus JSON strings for the nested layers."""
+    ranked = run["priorities"].get("ranked", [])
+    row = {
+        "_cursor": position,
+        "run_id": run["run_id"],
+        "timestamp": run["timestamp"],
+        "company": run["company"],
+        "desired_outcomes": run["desired_outcomes"],
+        "scoring_version": run.get("scoring_version", ""),
+        "top_priority_dimension": ranked[0]["dimension"] if ranked else "",
+        "top_priority_score": float(ranked[0]["priority"]) if ranked else 0.0,
+    }
+    for dim in DIMENSIONS:
+        detail = run["priorities"]["by_dimension"][dim]
+        row[f"{dim}_priority"] = float(detail["priority"])
+        row[f"{dim}_gap"] = float(detail["gap"])
+        row[f"{dim}_impact_mean"] = float(detail["impact_mean"])
+    for layer in ("canonical", "corpus", "transactional"):
+        row[f"{layer}_json"] = json.dumps(run[layer])
+    return row
+
+
+class _ChunkSink:
+    """Minimal writable file that hands written bytes back to the generator."""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        out = b"".join(self.chunks)
+        self.chunks.clear()
+        return out
+
+
+def parquet_stream(
+    records: Iterator[Tuple[int, Dict[str, Any]]],
+    row_group_size: int = ROW_GROUP_SIZE,
+) -> Iterator[bytes]:
+    """Parquet file written and streamed one row group at a time (requires pyarrow)."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    sink = _ChunkSink()
+    writer = None
+    batch: List[Dict[str, Any]] = []
+
+    def flush_batch():
+        nonlocal writer
+        table = pa.Table.from_pylist(batch)
+        if writer is None:
+            writer = pq.ParquetWriter(sink, table.schema, compression="zstd")
+        writer.write_table(table, row_group_size=len(batch))
+        batch.clear()
+
+    for position, run in records:
+        batch.append(_flatten(position, run))
+        if len(batch) >= row_group_size:
+            flush_batch()
+            yield sink.drain()
+    if batch or writer is None:
+        if batch:
+            flush_batch()
+        else:  # empty export: still a valid (zero-row) Parquet file
+            writer = pq.ParquetWriter(sink, pa.schema([("_cursor", pa.int64()), ("run_id", pa.string())]))
+    writer.close()
+    yield sink.drain()
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
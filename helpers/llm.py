@@ -1,32 +1,33 @@
 """LLM interaction helpers for SWOT analysis."""
 
-from typing import Dict, List
-from langchain_core.messages import HumanMessage, SystemMessage
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
 
+from .compaction import count_tokens, render_seed
 from .models import LayerOutput
+from .scoring import DIMENSIONS
 
+# Notes shorter than this (or the "No <layer> notes provided." nudge) carry no evidence,
+# so an all-empty extraction is a legitimate answer rather than a failed one
+EVIDENCE_MIN_TOKENS = 12
 
-def prompt_layer_to_json(
-    llm,
+
+def _build_messages(
     layer: str,
     company: str,
     desired_outcomes: str,
     raw_text: str,
     canonical_seed: Dict[str, List[str]]
-) -> LayerOutput:
-    """
-    Ask the LLM to produce structured JSON for the given layer using with_structured_output.
-    The model should return concise SWOT items with impact (1-10) and sentiment (-1..1).
-    """
+) -> List[BaseMessage]:
+    """System + user messages for one layer extraction."""
     seed_note = ""
     if layer.lower() == "canonical" and any(canonical_seed.values()):
         seed_note = (
             "\nUse these optional seed items (from form quadrants) only if helpful, "
             "but do not exceed 6 items per quadrant:\n"
-            f"- strengths_seed: {canonical_seed.get('strengths', [])}\n"
-            f"- weaknesses_seed: {canonical_seed.get('weaknesses', [])}\n"
-            f"- opportunities_seed: {canonical_seed.get('opportunities', [])}\n"
-            f"- threats_seed: {canonical_seed.get('threats', [])}\n"
+            f"{render_seed(canonical_seed)}\n"
         )
 
     system_msg = f"""You are a strategy analyst. Convert raw notes for the '{layer}' layer of a company's SWOT into a structured output.
@@ -54,17 +55,262 @@ Raw Notes:
     print("="*70)
     print(user_msg[:2000] + ("...\n" if len(user_msg) > 2000 else "\n"))
 
-    # Use with_structured_output for reliable parsing
-    structured_llm = llm.with_structured_output(LayerOutput)
-
-    result = structured_llm.invoke([
+    return [
         SystemMessage(content=system_msg.strip()),
         HumanMessage(content=user_msg.strip())
-    ])
+    ]
+
 
+def _stamp(result: LayerOutput, layer: str, company: str, desired_outcomes: str) -> LayerOutput:
     # Ensure layer, company, and desired_outcomes are set correctly
     result.layer = layer
     result.company = company
     result.desired_outcomes = desired_outcomes
-
     return result
+
+
+def has_evidence(raw_text: str) -> bool:
+    text = raw_text.strip()
+    if text.startswith("No ") and text.endswith(" notes provided."):
+        return False
+    return count_tokens(text) >= EVIDENCE_MIN_TOKENS
+
+
+def validate_layer_output(
+    result: Optional[LayerOutput],
+    raw_text: str,
+    canonical_seed: Dict[str, List[str]],
+) -> Optional[str]:
+    """Why an extraction fails the selector's check (None when it passes)."""
+    if result is None:
+        return "schema"
+    if has_evidence(raw_text) and not any(getattr(result, dim) for dim in DIMENSIONS):
+        return "empty quadrants"
+    return None
+
+
+def seed_gaps(result: LayerOutput, canonical_seed: Dict[str, List[str]]) -> List[str]:
+    """
+    Seeded quadrants the extraction left empty. Seeds are optional hints, so this is
+    reported in `run_metadata` only and never fails an output or triggers a fallback.
+    """
+    return [dim for dim in DIMENSIONS if canonical_seed.get(dim) and not getattr(result, dim)]
+
+
+class ModelRouter:
+    """
+    Chooses the chat model for each layer extraction and keeps per-model metrics.
+        - Route: inputs of `large_input_tokens`+ go to `large_model`, else the layer's
+          entry in `layer_models`, else `default_model`
+        - Selector (`select=True`): candidates are the `ladder` models (weakest → strongest)
+          at least as strong as the routed one, fastest observed median latency first;
+          an output failing `validate_layer_output` falls back to a stronger model
+    Pass a router wherever an `llm` is expected by `prompt_layer_to_json` / `aprompt_layer_to_json`.
+    """
+
+    def __init__(
+        self,
+        make_llm: Callable[[str], Any],
+        default_model: str,
+        layer_models: Optional[Dict[str, str]] = None,
+        large_model: Optional[str] = None,
+        large_input_tokens: int = 1000,
+        ladder: Optional[List[str]] = None,
+        select: bool = False,
+        window: int = 200,
+    ):
+        self.make_llm = make_llm
+        self.default_model = default_model
+        self.layer_models = {k.lower(): v for k, v in (layer_models or {}).items() if v}
+        self.large_model = large_model
+        self.large_input_tokens = large_input_tokens
+        self.ladder = ladder or [default_model]
+        self.select = select
+        self._clients: Dict[str, Any] = {}
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._window = window
+        self.metrics: Dict[str, Dict[str, int]] = {}
+
+    def client(self, model: str):
+        if model not in self._clients:
+            self._clients[model] = self.make_llm(model)
+        return self._clients[model]
+
+    def route(self, layer: str, input_tokens: int) -> Tuple[str, str]:
+        """(model, rule) for a layer and input size; rule is "size", "layer" or "default"."""
+        if self.large_model and input_tokens >= self.large_input_tokens:
+            return self.large_model, "size"
+        if layer.lower() in self.layer_models:
+            return self.layer_models[layer.lower()], "layer"
+        return self.default_model, "default"
+
+    def _strength(self, model: str) -> int:
+        return self.ladder.index(model) if model in self.ladder else -1
+
+    def median_latency(self, model: str) -> Optional[float]:
+        samples = sorted(self._latencies.get(model, ()))
+        return samples[len(samples) // 2] if samples else None
+
+    def candidates(self, routed: str) -> List[str]:
+        if not self.select:
+            return [routed]
+        floor = max(self._strength(routed), 0)
+        eligible = self.ladder[floor:]
+        if routed not in eligible:
+            eligible = [routed] + eligible
+        # Unmeasured models go last in ladder order, so the cheapest gets measured first
+        return sorted(
+            eligible,
+            key=lambda m: (self.median_latency(m) is None, self.median_latency(m) or 0.0, self._strength(m)),
+        )
+
+    def record(self, model: str, latency: float, usage: Dict[str, int], outcome: str) -> None:
+        m = self.metrics.setdefault(model, {"calls": 0, "ok": 0, "invalid": 0, "errors": 0,
+                                            "input_tokens": 0, "output_tokens": 0})
+        m["calls"] += 1
+        m["ok" if outcome == "ok" else "errors" if outcome.startswith("error") else "invalid"] += 1
+        m["input_tokens"] += usage.get("input_tokens", 0)
+        m["output_tokens"] += usage.get("output_tokens", 0)
+        if not outcome.startswith("error"):
+            self._latencies.setdefault(model, deque(maxlen=self._window)).append(latency)
+
+    def stats(self) -> Dict[str, Any]:
+        report = {}
+        for model, m in self.metrics.items():
+            samples = sorted(self._latencies.get(model, ()))
+            p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))] if samples else None
+            report[model] = {
+                **m,
+                "pass_rate": round(m["ok"] / m["calls"], 4) if m["calls"] else None,
+                "latency_p50_ms": round(self.median_latency(model) * 1000, 1) if samples else None,
+                "latency_p95_ms": round(p95 * 1000, 1) if samples else None,
+                "avg_output_tokens": round(m["output_tokens"] / m["calls"], 1) if m["calls"] else None,
+            }
+        return {"select": self.select, "ladder": self.ladder, "models": report}
+
+    def begin(self, layer: str, raw_text: str, canonical_seed: Dict[str, List[str]]) -> "_Selection":
+        return _Selection(self, layer, raw_text, canonical_seed)
+
+
+class _Selection:
+    """One routed extraction: hands out models to try and records every attempt."""
+
+    def __init__(self, router: ModelRouter, layer: str, raw_text: str, canonical_seed: Dict[str, List[str]]):
+        self.router = router
+        self.raw_text = raw_text
+        self.canonical_seed = canonical_seed
+        self.input_tokens = count_tokens(raw_text)
+        self.routed, self.rule = router.route(layer, self.input_tokens)
+        self.remaining = router.candidates(self.routed)
+        self.attempts: List[Dict[str, Any]] = []
+        self.accepted: Optional[Tuple[LayerOutput, str]] = None
+        self.fallback: Optional[Tuple[LayerOutput, str]] = None  # schema-valid but failed validation
+        self.error: Optional[Exception] = None
+
+    def next_model(self) -> Optional[str]:
+        if self.accepted is not None or not self.remaining:
+            return None
+        return self.remaining.pop(0)
+
+    def _attempted(self, model: str, latency: float, usage: Dict[str, int], outcome: str) -> None:
+        self.router.record(model, latency, usage, outcome)
+        self.attempts.append({"model": model, "outcome": outcome, "latency_ms": round(latency * 1000, 1), **usage})
+        if outcome != "ok":
+            # Fall back only to models stronger than the one that just failed
+            self.remaining = [m for m in self.remaining if self.router._strength(m) > self.router._strength(model)]
+
+    def failed(self, model: str, latency: float, exc: Exception) -> None:
+        self.error = exc
+        self._attempted(model, latency, {}, f"error: {type(exc).__name__}")
+
+    def done(self, model: str, latency: float, out: Dict[str, Any]) -> None:
+        raw = out.get("raw")
+        usage = {k: v for k, v in (getattr(raw, "usage_metadata", None) or {}).items()
+                 if k in ("input_tokens", "output_tokens")}
+        parsed = out.get("parsed")
+        reason = validate_layer_output(parsed, self.raw_text, self.canonical_seed)
+        if parsed is None and out.get("parsing_error") is not None:
+            self.error = out["parsing_error"]
+        self._attempted(model, latency, usage, "ok" if reason is None else f"invalid: {reason}")
+        if reason is None:
+            self.accepted = (parsed, model)
+        elif parsed is not None:
+            self.fallback = (parsed, model)
+
+    def result(self, layer: str, company: str, desired_outcomes: str) -> LayerOutput:
+        chosen = self.accepted or self.fallback
+        if chosen is None:
+            raise self.error or RuntimeError(f"No model produced a {layer} extraction")
+        result, model = chosen
+        result.run_metadata = {
+            "model": model,
+            "route": {"model": self.routed, "rule": self.rule, "input_tokens": self.input_tokens},
+            "selector": self.router.select,
+            "validated": self.accepted is not None,
+            "seed_gaps": seed_gaps(result, self.canonical_seed),
+            "latency_ms": sum(a["latency_ms"] for a in self.attempts),
+            "input_tokens": sum(a.get("input_tokens", 0) for a in self.attempts),
+            "output_tokens": sum(a.get("output_tokens", 0) for a in self.attempts),
+            "attempts": self.attempts,
+        }
+        return _stamp(result, layer, company, desired_outcomes)
+
+
+def prompt_layer_to_json(
+    llm,
+    layer: str,
+    company: str,
+    desired_outcomes: str,
+    raw_text: str,
+    canonical_seed: Dict[str, List[str]]
+) -> LayerOutput:
+    """
+    Ask the LLM to produce structured JSON for the given layer using with_structured_output.
+    The model should return concise SWOT items with impact (1-10) and sentiment (-1..1).
+    """
+    messages = _build_messages(layer, company, desired_outcomes, raw_text, canonical_seed)
+    if isinstance(llm, ModelRouter):
+        selection = llm.begin(layer, raw_text, canonical_seed)
+        while (model := selection.next_model()) is not None:
+            structured = llm.client(model).with_structured_output(LayerOutput, include_raw=True)
+            started = time.perf_counter()
+            try:
+                out = structured.invoke(messages)
+            except Exception as exc:
+                selection.failed(model, time.perf_counter() - started, exc)
+                continue
+            selection.done(model, time.perf_counter() - started, out)
+        return selection.result(layer, company, desired_outcomes)
+
+    # Use with_structured_output for reliable parsing
+    structured_llm = llm.with_structured_output(LayerOutput)
+    result = structured_llm.invoke(messages)
+    return _stamp(result, layer, company, desired_outcomes)
+
+
+async def aprompt_layer_to_json(
+    llm,
+    layer: str,
+    company: str,
+    desired_outcomes: str,
+    raw_text: str,
+    canonical_seed: Dict[str, List[str]]
+) -> LayerOutput:
+    """Async `prompt_layer_to_json`; cancelling the task aborts the in-flight HTTP call."""
+    messages = _build_messages(layer, company, desired_outcomes, raw_text, canonical_seed)
+    if isinstance(llm, ModelRouter):
+        selection = llm.begin(layer, raw_text, canonical_seed)
+        while (model := selection.next_model()) is not None:
+            structured = llm.client(model).with_structured_output(LayerOutput, include_raw=True)
+            started = time.perf_counter()
+            try:
+                out = await structured.ainvoke(messages)
+            except Exception as exc:
+                selection.failed(model, time.perf_counter() - started, exc)
+                continue
+            selection.done(model, time.perf_counter() - started, out)
+        return selection.result(layer, company, desired_outcomes)
+
+    structured_llm = llm.with_structured_output(LayerOutput)
+    result = await structured_llm.ainvoke(messages)
+    return _stamp(result, layer, company, desired_outcomes)
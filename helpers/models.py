@@ -2,6 +2,7 @@
 
 from typing import Dict, List, Any
 from pydantic import BaseModel, Field
+from pydantic.json_schema import SkipJsonSchema
 
 
 class SWOTItem(BaseModel):
@@ -18,6 +19,9 @@ class LayerOutput(BaseModel):
     weaknesses: List[SWOTItem] = []
     opportunities: List[SWOTItem] = []
     threats: List[SWOTItem] = []
+    # Model routing / latency / token usage of the call that produced this output.
+    # Kept out of the JSON schema so the LLM never sees (or fills) it.
+    run_metadata: SkipJsonSchema[Dict[str, Any]] = {}
 
 
 class RunSummary(BaseModel):
@@ -29,3 +33,9 @@ class RunSummary(BaseModel):
     corpus: LayerOutput
     transactional: LayerOutput
     priorities: Dict[str, Any]  # computed gap × impact per dimension
+    scoring_version: str = "v1"  # scoring version that produced `priorities`
+    priorities_by_version: Dict[str, Dict[str, Any]] = {}  # offline re-scores keyed by version
+    layer_inputs: Dict[str, str] = {}  # fingerprint text per layer, for near-duplicate reuse
+    reuse: Dict[str, Any] = {}  # near-duplicate matches / reuse decisions for this run
+    compaction: Dict[str, Dict[str, int]] = {}  # per-layer prompt token counts before/after compaction
+    drafted: List[str] = []  # layers taken from a speculative draft started while the form was edited
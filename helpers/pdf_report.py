@@ -0,0 +1,136 @@
+"""Server-side PDF rendering of SWOT results (reportlab), cached on disk."""
+
+import json
+import os
+import zlib
+from pathlib import Path
+from typing import List, Optional
+from xml.sax.saxutils import escape
+
+from .cache import file_lock
+from .models import RunSummary, SWOTItem
+from .scoring import DIMENSIONS, LAYERS
+
+# Bump whenever the report layout changes so cached PDFs are re-rendered
+PDF_TEMPLATE_VERSION = "1"
+REPORT_DIRNAME = "reports"
+RENDER_LOCK_SLOTS = 16  # fixed set of lock files shared by all reports
+
+QUADRANT_COLORS = {
+    "strengths": "#d1fae5",
+    "weaknesses": "#fee2e2",
+    "opportunities": "#dbeafe",
+    "threats": "#fef3c7",
+}
+
+
+def pdf_available() -> bool:
+    try:
+        import reportlab  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def report_path(run_id: str, data_dir: Path) -> Path:
+    return data_dir / REPORT_DIRNAME / f"{run_id}.v{PDF_TEMPLATE_VERSION}.pdf"
+
+
+def invalidate_report(run_id: str, data_dir: Path) -> None:
+    """Drop the cached PDF after a run's content changes (re-score, re-import)."""
+    report_path(run_id, data_dir).unlink(missing_ok=True)
+
+
+def cached_report(run_id: str, data_dir: Path) -> Optional[Path]:
+    path = report_path(run_id, data_dir)
+    return path if path.exists() else None
+
+
+def render_pdf(summary: RunSummary) -> bytes:
+    """Render the results report (priorities table + SWOT items per layer) to PDF bytes."""
+    from io import BytesIO
+
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib.units import mm
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+    styles = getSampleStyleSheet()
+    body = styles["BodyText"]
+    buf = BytesIO()
+    doc = SimpleDocTemplate(
+        buf, pagesize=A4, title=f"SWOT DCIF Results – {summary.company}",
+        leftMargin=16 * mm, rightMargin=16 * mm, topMargin=16 * mm, bottomMargin=16 * mm,
+    )
+
+    story = [
+        Paragraph(f"SWOT DCIF Results – {escape(summary.company)}", styles["Title"]),
+        Paragraph(f"<b>Run ID:</b> {escape(summary.run_id)}", body),
+        Paragraph(f"<b>Timestamp:</b> {escape(summary.timestamp)}", body),
+        Paragraph(f"<b>Desired Outcomes:</b> {escape(summary.desired_outcomes)}", body),
+        Spacer(1, 6 * mm),
+        Paragraph("Top Priorities (Gap × Impact)", styles["Heading2"]),
+    ]
+
+    rows = [["Dimension", "Priority", "Gap", "Impact Mean"]] + [
+        [r["dimension"].title(), r["priority"], r["gap"], r["impact_mean"]]
+        for r in summary.priorities.get("ranked", [])
+    ]
+    table = Table(rows, hAlign="LEFT", colWidths=[50 * mm, 30 * mm, 30 * mm, 35 * mm])
+    table.setStyle(TableStyle([
+        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#f9fafb")),
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("LINEBELOW", (0, 0), (-1, -1), 0.25, colors.HexColor("#e5e7eb")),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 5),
+    ]))
+    story += [table, Spacer(1, 6 * mm)]
+
+    def items_cell(items: List[SWOTItem]) -> List[Paragraph]:
+        if not items:
+            return [Paragraph("<i>No items</i>", body)]
+        return [Paragraph(f"<b>[{i.impact}]</b> {escape(i.text)}", body) for i in items]
+
+    for dim in DIMENSIONS:
+        story.append(Paragraph(dim.title(), styles["Heading2"]))
+        grid = Table(
+            [[layer.title() for layer in LAYERS],
+             [items_cell(getattr(getattr(summary, layer), dim)) for layer in LAYERS]],
+            colWidths=[doc.width / len(LAYERS)] * len(LAYERS),
+        )
+        grid.setStyle(TableStyle([
+            ("BACKGROUND", (0, 0), (-1, -1), colors.HexColor(QUADRANT_COLORS[dim])),
+            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+            ("VALIGN", (0, 0), (-1, -1), "TOP"),
+            ("GRID", (0, 0), (-1, -1), 0.25, colors.white),
+        ]))
+        story += [grid, Spacer(1, 4 * mm)]
+
+    doc.build(story)
+    return buf.getvalue()
+
+
+def _render_lock(out_path: str) -> Path:
+    """
+    One of RENDER_LOCK_SLOTS lock files in the reports dir, picked by report name: renders of
+    the same report always share a slot, and no lock file is left behind per run.
+    """
+    slot = zlib.crc32(os.path.basename(out_path).encode("utf-8")) % RENDER_LOCK_SLOTS
+    return Path(os.path.dirname(out_path)) / f".render.{slot}.lock"
+
+
+def render_report_file(run_path: str, out_path: str) -> str:
+    """Load a stored run, render it and write the PDF atomically. Runs in a worker process."""
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    # Another uvicorn worker may be rendering the same report; wait for it instead of duplicating
+    with file_lock(_render_lock(out_path)):
+        if os.path.exists(out_path) and os.path.getmtime(out_path) >= os.path.getmtime(run_path):
+            return out_path
+        with open(run_path, "r", encoding="utf-8") as f:
+            summary = RunSummary(**json.load(f))
+        pdf = render_pdf(summary)
+        tmp_path = f"{out_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(pdf)
+        os.replace(tmp_path, out_path)
+    return out_path
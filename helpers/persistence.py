@@ -1,40 +1,233 @@
 """Data persistence helpers for SWOT analysis."""
 
 import json
+import os
+import re
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
 import pandas as pd
 
+from .cache import SharedCache, notify_store_changed, run_file_version, store_lock
+from .dedup import index_runs_layer_inputs
 from .models import RunSummary
+from .pdf_report import invalidate_report
+from .rollups import company_key, rebuild_company_rollup, update_company_rollups
+from .search import index_runs
 
 
-def persist_run(summary: RunSummary, data_dir: Path, csv_file: Path) -> None:
-    """Save run summary to JSON file and append to CSV."""
-    run_path = data_dir / f"{summary.run_id}.json"
-    with open(run_path, "w", encoding="utf-8") as f:
-        json.dump(summary.model_dump(), f, indent=2)
+# Run ids become file names in the data dir: plain names only, no separators or ".."
+RUN_ID_PATTERN = re.compile(r"^\w[\w.-]*$")
+
+
+def is_valid_run_id(run_id: str) -> bool:
+    return bool(RUN_ID_PATTERN.match(run_id)) and ".." not in run_id
+
+
+def run_id_slug(company: str) -> str:
+    """Company name reduced to characters that are safe inside a run id."""
+    return re.sub(r"[^\w-]+", "_", company.strip()).strip("_") or "run"
 
-    row = {
+
+def _index_row(summary: RunSummary) -> dict:
+    ranked = summary.priorities["ranked"]
+    return {
         "timestamp": summary.timestamp,
         "run_id": summary.run_id,
         "company": summary.company,
         "desired_outcomes": summary.desired_outcomes,
-        "top_priority_dimension": summary.priorities["ranked"][0]["dimension"] if summary.priorities["ranked"] else "",
-        "top_priority_score": summary.priorities["ranked"][0]["priority"] if summary.priorities["ranked"] else 0.0,
+        "top_priority_dimension": ranked[0]["dimension"] if ranked else "",
+        "top_priority_score": ranked[0]["priority"] if ranked else 0.0,
     }
+
+
+def run_exists(run_id: str, data_dir: Path) -> bool:
+    return is_valid_run_id(run_id) and (data_dir / f"{run_id}.json").exists()
+
+
+class PendingReplacements:
+    """
+    CSV rows and company rollups of overwritten runs, collected across the batches of one
+    import and applied once at the end by `apply_replacements` instead of once per batch.
+    """
+
+    def __init__(self):
+        self.rows: Dict[str, dict] = {}  # run_id -> its new index row
+        self.company_keys: set = set()  # rollups to recompute (previous and new company)
+
+    def __bool__(self) -> bool:
+        return bool(self.rows)
+
+
+def persist_runs(
+    summaries: List[RunSummary],
+    data_dir: Path,
+    csv_file: Path,
+    pending: Optional[PendingReplacements] = None,
+) -> None:
+    """
+    Batched write path: one JSON file per run, but a single CSV append, one rollup
+    write per company and one search / near-duplicate index transaction for the batch.
+    A run_id that is already stored is replaced everywhere: its CSV row is updated in place
+    (export cursors keep their positions), its company's rollup recomputed and its index
+    entries swapped. With `pending`, the CSV rows and rollups of replaced runs are only
+    recorded there, for one `apply_replacements` after the last batch.
+    """
+    if not summaries:
+        return
+    for summary in summaries:
+        if not is_valid_run_id(summary.run_id):
+            raise ValueError(f"Invalid run_id: {summary.run_id!r}")
+    # Previous company of each run being overwritten (the rollup it was counted in)
+    replaced: Dict[str, str] = {}
+    for summary in summaries:
+        if run_exists(summary.run_id, data_dir):
+            previous = load_run(summary.run_id, data_dir)
+            replaced[summary.run_id] = previous.company if previous else summary.company
+    for summary in summaries:
+        run_path = data_dir / f"{summary.run_id}.json"
+        tmp_path = run_path.with_name(f"{run_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(summary.model_dump_json(indent=2))  # pydantic-core encoder; json.dump(indent=) is pure Python
+        os.replace(tmp_path, run_path)
+        invalidate_report(summary.run_id, data_dir)
+
+    rows = [_index_row(summary) for summary in summaries if summary.run_id not in replaced]
+    replaced_rows = {summary.run_id: _index_row(summary) for summary in summaries if summary.run_id in replaced}
+    affected = {company_key(c) for c in replaced.values()}
+    affected |= {company_key(s.company) for s in summaries if s.run_id in replaced}
+    if pending is not None:
+        pending.rows.update(replaced_rows)
+        pending.company_keys |= affected
+        affected |= pending.company_keys  # their rollups are recomputed at the end anyway
+    # File lock, not just a thread lock: several uvicorn workers share the store
+    with store_lock(data_dir):
+        # Append instead of re-reading the whole index on every run
+        if rows:
+            pd.DataFrame(rows).to_csv(csv_file, mode="a", header=not csv_file.exists(), index=False)
+        update_company_rollups([s for s in summaries if company_key(s.company) not in affected], data_dir)
+        if replaced_rows and pending is None:
+            _replace_index_rows(csv_file, replaced_rows)
+            _rebuild_company_rollups(csv_file, affected, data_dir)
+        # Under the lock too, so an index rebuild never swaps its file in mid-write
+        index_runs(summaries, data_dir)
+        index_runs_layer_inputs(summaries, data_dir)
+    notify_store_changed(data_dir)
+
+
+def apply_replacements(pending: PendingReplacements, data_dir: Path, csv_file: Path) -> None:
+    """Update the CSV rows and recompute the rollups recorded by `persist_runs(..., pending=)`."""
+    if not pending:
+        return
+    with store_lock(data_dir):
+        _replace_index_rows(csv_file, pending.rows)
+        _rebuild_company_rollups(csv_file, pending.company_keys, data_dir)
+    notify_store_changed(data_dir)
+
+
+def _replace_index_rows(csv_file: Path, rows: Dict[str, dict], chunksize: int = 10_000) -> None:
+    """
+    Overwrite the CSV index rows of the given run_ids where they stand (chunked rewrite),
+    so row positions, which export cursors count, never move. Caller holds store_lock.
+    """
+    if not rows:
+        return
+    missing = dict(rows)  # stored runs without an index row (e.g. a crash before the append)
     if csv_file.exists():
-        df = pd.read_csv(csv_file)
-        df = pd.concat([df, pd.DataFrame([row])], ignore_index=True)
-        df.to_csv(csv_file, index=False)
-    else:
-        pd.DataFrame([row]).to_csv(csv_file, index=False)
+        tmp_path = csv_file.with_suffix(".csv.tmp")
+        header = True
+        for chunk in pd.read_csv(csv_file, chunksize=chunksize, dtype=str, keep_default_na=False):
+            hits = chunk["run_id"].isin(rows.keys())
+            if hits.any():
+                new = pd.DataFrame([rows[r] for r in chunk.loc[hits, "run_id"]], index=chunk.index[hits])
+                chunk.loc[hits, new.columns] = new.astype(str)
+                for run_id in chunk.loc[hits, "run_id"]:
+                    missing.pop(run_id, None)
+            chunk.to_csv(tmp_path, mode="w" if header else "a", header=header, index=False)
+            header = False
+        if not header:
+            os.replace(tmp_path, csv_file)
+    if missing:
+        pd.DataFrame(list(missing.values())).to_csv(csv_file, mode="a", header=not csv_file.exists(), index=False)
+
+
+def _rebuild_company_rollups(csv_file: Path, keys: set, data_dir: Path, chunksize: int = 10_000) -> None:
+    """Recompute the rollups of the given company keys from their runs listed in the CSV index."""
+    run_ids: Dict[str, List[str]] = {key: [] for key in keys}
+    names: Dict[str, str] = {}
+    for chunk in pd.read_csv(csv_file, chunksize=chunksize, dtype={"run_id": str, "company": str}):
+        for run_id, company in zip(chunk["run_id"], chunk["company"]):
+            key = company_key(company)
+            if key in run_ids:
+                run_ids[key].append(run_id)
+                names.setdefault(key, company)
+    for key, ids in run_ids.items():
+        runs = [run for run in (load_run(run_id, data_dir) for run_id in ids) if run is not None]
+        rebuild_company_rollup(names.get(key, key), runs, data_dir)
+
+
+def persist_run(summary: RunSummary, data_dir: Path, csv_file: Path) -> None:
+    """Save run summary to JSON file, append to CSV, and update the rollup, search and near-duplicate indexes."""
+    persist_runs([summary], data_dir, csv_file)
 
 
 def load_run(run_id: str, data_dir: Path) -> Optional[RunSummary]:
     """Load run summary from JSON file."""
+    if not is_valid_run_id(run_id):
+        return None
     path = data_dir / f"{run_id}.json"
     if not path.exists():
         return None
     with open(path, "r", encoding="utf-8") as f:
         data = json.load(f)
     return RunSummary(**data)
+
+
+def load_run_cached(run_id: str, data_dir: Path, cache: SharedCache) -> Optional[RunSummary]:
+    """
+    `load_run` through a shared cache (built with model=RunSummary), keyed by the run file's
+    mtime so rewrites are picked up.
+    """
+    version = run_file_version(run_id, data_dir) if is_valid_run_id(run_id) else None
+    if version is None:
+        return None
+    return cache.get_or_compute(run_id, version, lambda: load_run(run_id, data_dir))
+
+
+def iter_run_paths(data_dir: Path) -> Iterator[Path]:
+    """Yield stored run JSON files lazily, without listing the whole directory up front."""
+    with os.scandir(data_dir) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.name.endswith(".json"):
+                yield Path(entry.path)
+
+
+IndexUpdates = Dict[str, Tuple[str, float]]  # run_id -> (top_priority_dimension, top_priority_score)
+
+
+def update_run_index(
+    csv_file: Path,
+    updates: Union[IndexUpdates, Callable[[List[str]], IndexUpdates]],
+    chunksize: int = 10_000,
+) -> None:
+    """
+    Rewrite top-priority columns in the CSV index for the given run_ids, chunk by chunk.
+    `updates` may also be a lookup called with each chunk's run_ids, so the full set of
+    updates never has to be held in memory.
+    """
+    if not csv_file.exists() or not updates:
+        return
+    lookup = updates if callable(updates) else (lambda ids: {r: updates[r] for r in ids if r in updates})
+    tmp_path = csv_file.with_suffix(".csv.tmp")
+    header = True
+    for chunk in pd.read_csv(csv_file, chunksize=chunksize, dtype={"run_id": str}):
+        found = lookup(chunk["run_id"].tolist())
+        hits = chunk["run_id"].isin(found.keys())
+        if hits.any():
+            chunk = chunk.astype({"top_priority_dimension": "object"})
+            chunk.loc[hits, "top_priority_dimension"] = chunk.loc[hits, "run_id"].map(lambda r: found[r][0])
+            chunk.loc[hits, "top_priority_score"] = chunk.loc[hits, "run_id"].map(lambda r: found[r][1])
+        chunk.to_csv(tmp_path, mode="w" if header else "a", header=header, index=False)
+        header = False
+    if not header:
+        os.replace(tmp_path, csv_file)
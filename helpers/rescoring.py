@@ -0,0 +1,181 @@
+"""Offline re-scoring of stored runs (no LLM calls)."""
+
+import json
+import os
+import sqlite3
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .cache import file_lock, notify_store_changed, store_lock
+from .models import RunSummary
+from .pdf_report import invalidate_report
+from .persistence import iter_run_paths, update_run_index
+from .rollups import rebuild_rollups
+from .scoring import SCORING_VERSION, get_scorer
+
+
+RESCORE_LOCK = "rescore.lock"
+
+
+class RescoreInProgress(Exception):
+    """Another re-scoring pass holds the data dir."""
+
+
+def reserve_rescore(data_dir: Path) -> ExitStack:
+    """
+    Take the one-pass-at-a-time lock now, e.g. before scheduling a pass in the background;
+    hand it to `rescore_runs(held=...)`, which releases it when the pass ends.
+    Raises RescoreInProgress when another pass holds it.
+    """
+    held = ExitStack()
+    try:
+        held.enter_context(file_lock(data_dir / RESCORE_LOCK, blocking=False))
+    except BlockingIOError:
+        raise RescoreInProgress(f"A re-scoring pass is already running in {data_dir}") from None
+    return held
+
+
+def rescore_running(data_dir: Path) -> bool:
+    try:
+        with file_lock(data_dir / RESCORE_LOCK, blocking=False):
+            return False
+    except BlockingIOError:
+        return True
+
+
+def _journal_path(data_dir: Path, version: str) -> Path:
+    return data_dir / f"rescore_{version}.sqlite3"
+
+
+def _open_journal(path: Path) -> sqlite3.Connection:
+    """On-disk map of the runs re-scored so far (their new index rows), so memory stays flat."""
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS done (run_id TEXT PRIMARY KEY, "
+        "top_priority_dimension TEXT NOT NULL, top_priority_score REAL NOT NULL)"
+    )
+    return conn
+
+
+def _journal_lookup(journal: sqlite3.Connection, run_ids: List[str], batch: int = 500) -> Dict[str, Tuple[str, float]]:
+    found: Dict[str, Tuple[str, float]] = {}
+    for i in range(0, len(run_ids), batch):
+        ids = run_ids[i:i + batch]
+        rows = journal.execute(
+            "SELECT run_id, top_priority_dimension, top_priority_score FROM done "
+            f"WHERE run_id IN ({','.join('?' * len(ids))})", ids,
+        )
+        found.update((run_id, (dim, score)) for run_id, dim, score in rows)
+    return found
+
+
+def _rescore_file(path: str, version: str, promote: bool) -> Tuple[str, str, float]:
+    """Re-score one run file in place. Runs in a worker process."""
+    with open(path, "r", encoding="utf-8") as f:
+        summary = RunSummary(**json.load(f))
+
+    priorities = get_scorer(version)(summary.canonical, summary.corpus, summary.transactional)
+    summary.priorities_by_version[version] = priorities
+    if promote:
+        summary.priorities = priorities
+        summary.scoring_version = version
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(summary.model_dump(), f, indent=2)
+    os.replace(tmp_path, path)
+    invalidate_report(summary.run_id, Path(path).parent)
+
+    ranked = priorities["ranked"]
+    top_dim = ranked[0]["dimension"] if ranked else ""
+    top_score = ranked[0]["priority"] if ranked else 0.0
+    return summary.run_id, top_dim, top_score
+
+
+def rescore_runs(
+    data_dir: Path,
+    csv_file: Optional[Path] = None,
+    version: str = SCORING_VERSION,
+    workers: Optional[int] = None,
+    promote: bool = True,
+    resume: bool = True,
+    held: Optional[ExitStack] = None,
+) -> Dict[str, Any]:
+    """
+    Stream every stored run through the scorer for `version` in a process pool.
+        - Results are written back under `priorities_by_version[version]`
+          (and to `priorities` when `promote` is set)
+        - Completed runs and their new index rows go to an on-disk journal (SQLite) so an
+          interrupted pass resumes; it is removed once a pass completes without failures
+        - Only a bounded window of runs is in flight and results stay on disk, so memory
+          stays flat however many runs are stored
+        - One pass at a time per data dir; a concurrent call raises RescoreInProgress
+          (`held` is a lock already taken with `reserve_rescore`)
+    The CSV index and company rollups are refreshed at the end when `promote` is set.
+    """
+    with held if held is not None else reserve_rescore(data_dir):
+        get_scorer(version)  # fail fast on unknown versions
+        return _rescore_pass(data_dir, csv_file, version, workers, promote, resume)
+
+
+def _rescore_pass(
+    data_dir: Path,
+    csv_file: Optional[Path],
+    version: str,
+    workers: Optional[int],
+    promote: bool,
+    resume: bool,
+) -> Dict[str, Any]:
+    workers = workers or os.cpu_count() or 1
+    journal_path = _journal_path(data_dir, version)
+    if not resume:
+        journal_path.unlink(missing_ok=True)
+    journal = _open_journal(journal_path)
+    rescored = skipped = failed = 0
+    max_in_flight = workers * 4
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = set()
+
+            def drain(block_until: int) -> None:
+                nonlocal pending, rescored, failed
+                while len(pending) > block_until:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    rows = []
+                    for fut in finished:
+                        try:
+                            rows.append(fut.result())
+                        except Exception as exc:  # keep going; failed runs are retried next pass
+                            failed += 1
+                            print(f"[rescore] failed: {exc}")
+                    with journal:
+                        journal.executemany("INSERT OR REPLACE INTO done VALUES (?, ?, ?)", rows)
+                    rescored += len(rows)
+
+            for path in iter_run_paths(data_dir):
+                if journal.execute("SELECT 1 FROM done WHERE run_id = ?", (path.stem,)).fetchone():
+                    skipped += 1
+                    continue
+                pending.add(pool.submit(_rescore_file, str(path), version, promote))
+                drain(max_in_flight)
+            drain(0)
+
+        if promote:
+            with store_lock(data_dir):
+                if csv_file is not None:
+                    # Journaled rows from an interrupted pass are included, so the whole index is refreshed
+                    update_run_index(csv_file, lambda run_ids: _journal_lookup(journal, run_ids))
+                rebuild_rollups(data_dir)
+        notify_store_changed(data_dir)
+    finally:
+        journal.close()
+
+    # Journal only serves to resume an interrupted pass; keep it while runs still need a retry
+    if not failed:
+        journal_path.unlink(missing_ok=True)
+
+    return {"version": version, "rescored": rescored, "skipped": skipped, "failed": failed}
+
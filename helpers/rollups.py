@@ -0,0 +1,187 @@
+"""Incrementally maintained per-company aggregates for trend queries."""
+
+import bisect
+import hashlib
+import json
+import os
+import re
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .models import RunSummary
+from .scoring import DIMENSIONS
+
+ROLLUP_DIRNAME = "rollups"
+SERIES_LEN = 50  # last-N points kept per dimension
+METRICS = ["priority", "gap", "impact_mean"]
+
+
+def company_key(company: str) -> str:
+    """
+    Filesystem-safe key for a company name, ignoring case, punctuation and spacing.
+    Any script: a casefolded word slug plus a short hash of the normalized name, so names
+    that share a slug (or have none that fits) still get their own key.
+    """
+    words = re.findall(r"\w+", unicodedata.normalize("NFKC", company).casefold())
+    normalized = " ".join(words)
+    digest = hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:8]
+    return f"{'_'.join(words)[:48].strip('_') or '_'}_{digest}"
+
+
+def _rollup_path(company: str, data_dir: Path) -> Path:
+    return data_dir / ROLLUP_DIRNAME / f"{company_key(company)}.json"
+
+
+def _empty_rollup(company: str) -> Dict[str, Any]:
+    return {
+        "company": company,
+        "run_count": 0,
+        "first_timestamp": None,
+        "last_timestamp": None,
+        "last_run_id": None,
+        "top_counts": {dim: 0 for dim in DIMENSIONS},
+        "dimensions": {
+            dim: {
+                "count": 0,
+                **{f"sum_{m}": 0.0 for m in METRICS},
+                "series": [],  # [timestamp, run_id, priority, gap, impact_mean], oldest first
+            }
+            for dim in DIMENSIONS
+        },
+    }
+
+
+def _apply_run(rollup: Dict[str, Any], summary: RunSummary) -> None:
+    """Fold one run into a rollup in place (no-op if the run is already in its recent series)."""
+    if any(point[1] == summary.run_id for point in rollup["dimensions"][DIMENSIONS[0]]["series"]):
+        return
+    ts = summary.timestamp
+    rollup["run_count"] += 1
+    if rollup["first_timestamp"] is None or ts < rollup["first_timestamp"]:
+        rollup["first_timestamp"] = ts
+    if rollup["last_timestamp"] is None or (ts, summary.run_id) >= (rollup["last_timestamp"], rollup["last_run_id"]):
+        rollup["last_timestamp"] = ts
+        rollup["last_run_id"] = summary.run_id
+
+    ranked = summary.priorities.get("ranked", [])
+    if ranked:
+        rollup["top_counts"][ranked[0]["dimension"]] += 1
+
+    for dim in DIMENSIONS:
+        detail = summary.priorities["by_dimension"][dim]
+        agg = rollup["dimensions"][dim]
+        agg["count"] += 1
+        for m in METRICS:
+            agg[f"sum_{m}"] += float(detail[m])
+        point = [ts, summary.run_id] + [detail[m] for m in METRICS]
+        series = agg["series"]
+        # Runs usually arrive in time order, so this is an append in practice
+        bisect.insort(series, point)
+        if len(series) > SERIES_LEN:
+            del series[: len(series) - SERIES_LEN]
+
+
+def _write_rollup(rollup: Dict[str, Any], data_dir: Path) -> None:
+    path = _rollup_path(rollup["company"], data_dir)
+    path.parent.mkdir(exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(rollup, f)
+    os.replace(tmp_path, path)
+
+
+def load_company_rollup(company: str, data_dir: Path) -> Optional[Dict[str, Any]]:
+    """Load the stored rollup for a company, or None if it has no runs."""
+    path = _rollup_path(company, data_dir)
+    if not path.exists():
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def update_company_rollups(summaries: List[RunSummary], data_dir: Path) -> None:
+    """Fold newly persisted runs into their companies' rollups (one read/write per company)."""
+    by_company: Dict[str, List[RunSummary]] = {}
+    for summary in summaries:
+        by_company.setdefault(company_key(summary.company), []).append(summary)
+    for runs in by_company.values():
+        rollup = load_company_rollup(runs[0].company, data_dir) or _empty_rollup(runs[0].company)
+        for summary in runs:
+            _apply_run(rollup, summary)
+        _write_rollup(rollup, data_dir)
+
+
+def rebuild_company_rollup(company: str, summaries: List[RunSummary], data_dir: Path) -> None:
+    """Recompute one company's rollup from its complete set of runs (removed when there are none)."""
+    if not summaries:
+        _rollup_path(company, data_dir).unlink(missing_ok=True)
+        return
+    rollup = _empty_rollup(summaries[0].company)
+    for summary in summaries:
+        _apply_run(rollup, summary)
+    _write_rollup(rollup, data_dir)
+
+
+def update_company_rollup(summary: RunSummary, data_dir: Path) -> None:
+    """Fold a newly persisted run into its company's rollup."""
+    update_company_rollups([summary], data_dir)
+
+
+def company_trend(company: str, data_dir: Path, dimension: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Serve a company's trend straight from its rollup (cost independent of history length).
+    Returns running means per dimension and the last-N series of priority, gap and impact mean.
+    """
+    rollup = load_company_rollup(company, data_dir)
+    if rollup is None:
+        return None
+
+    dims = [dimension] if dimension else DIMENSIONS
+    out = {}
+    for dim in dims:
+        agg = rollup["dimensions"][dim]
+        n = agg["count"] or 1
+        out[dim] = {
+            "count": agg["count"],
+            **{f"mean_{m}": round(agg[f"sum_{m}"] / n, 3) for m in METRICS},
+            "series": [
+                {"timestamp": p[0], "run_id": p[1], **dict(zip(METRICS, p[2:]))}
+                for p in agg["series"]
+            ],
+        }
+    return {
+        "company": rollup["company"],
+        "run_count": rollup["run_count"],
+        "first_timestamp": rollup["first_timestamp"],
+        "last_timestamp": rollup["last_timestamp"],
+        "last_run_id": rollup["last_run_id"],
+        "top_counts": rollup["top_counts"],
+        "dimensions": out,
+    }
+
+
+def rebuild_rollups(data_dir: Path) -> Dict[str, int]:
+    """Regenerate every company rollup from the stored runs."""
+    from .persistence import iter_run_paths
+
+    rollups: Dict[str, Dict[str, Any]] = {}
+    runs = 0
+    for path in iter_run_paths(data_dir):
+        with open(path, "r", encoding="utf-8") as f:
+            summary = RunSummary(**json.load(f))
+        key = company_key(summary.company)
+        if key not in rollups:
+            rollups[key] = _empty_rollup(summary.company)
+        _apply_run(rollups[key], summary)
+        runs += 1
+
+    rollup_dir = data_dir / ROLLUP_DIRNAME
+    if rollup_dir.exists():
+        for stale in rollup_dir.glob("*.json"):
+            if stale.stem not in rollups:
+                stale.unlink()
+    for rollup in rollups.values():
+        _write_rollup(rollup, data_dir)
+    return {"runs": runs, "companies": len(rollups)}
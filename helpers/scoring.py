@@ -1,10 +1,56 @@
 """Priority scoring logic for SWOT analysis."""
 
-from typing import Dict, List, Any
+from functools import partial
+from typing import Callable, Dict, List, Any, Optional
+
+import numpy as np
+
 from .models import LayerOutput, SWOTItem
 
 
 DIMENSIONS = ["strengths", "weaknesses", "opportunities", "threats"]
+LAYERS = ["canonical", "corpus", "transactional"]
+
+# Bump when the priority formula changes so stored runs can be re-scored offline
+SCORING_VERSION = "v1"
+
+# A scoring model maps per-layer average impacts and sentiments (last axis = layers)
+# to a priority. Models are written against NumPy arrays so the same kernel scores
+# a single run and thousands of Monte Carlo samples at once.
+ScoringModel = Callable[[np.ndarray, np.ndarray], np.ndarray]
+
+SCORING_MODELS: Dict[str, ScoringModel] = {}
+
+
+def register_scoring_model(name: str) -> Callable[[ScoringModel], ScoringModel]:
+    """Decorator: register a vectorized scoring model under `name`."""
+    def decorator(fn: ScoringModel) -> ScoringModel:
+        SCORING_MODELS[name] = fn
+        return fn
+    return decorator
+
+
+def _gap(values: np.ndarray) -> np.ndarray:
+    return values.max(axis=-1) - values.min(axis=-1)
+
+
+@register_scoring_model("v1")
+def _gap_x_impact(impacts: np.ndarray, sentiments: np.ndarray) -> np.ndarray:
+    """PRIORITY = GAP × IMPACT (sentiment ignored)."""
+    return _gap(impacts) * impacts.mean(axis=-1)
+
+
+@register_scoring_model("sentiment_gap")
+def _sentiment_gap(impacts: np.ndarray, sentiments: np.ndarray) -> np.ndarray:
+    """GAP × IMPACT, amplified up to 2× when the layers disagree on sentiment."""
+    return _gap(impacts) * impacts.mean(axis=-1) * (1.0 + _gap(sentiments) / 2.0)
+
+
+@register_scoring_model("sentiment_weighted")
+def _sentiment_weighted(impacts: np.ndarray, sentiments: np.ndarray) -> np.ndarray:
+    """GAP × IMPACT over impacts discounted by how weakly each layer feels about them."""
+    weighted = impacts * (0.5 + 0.5 * np.abs(sentiments))
+    return _gap(weighted) * weighted.mean(axis=-1)
 
 
 def _avg_impact(items: List[SWOTItem]) -> float:
@@ -18,16 +64,21 @@ def _avg_sentiment(items: List[SWOTItem]) -> float:
 def compute_priorities(
     canonical: LayerOutput,
     corpus: LayerOutput,
-    transactional: LayerOutput
+    transactional: LayerOutput,
+    model: str = SCORING_VERSION,
 ) -> Dict[str, Any]:
     """
     For each dimension:
         - Compute per-layer average impact and sentiment
         - GAP = max difference between any two layer average impacts
         - IMPACT = mean of the three layer impacts
-        - PRIORITY = round(GAP * IMPACT, 2)
+        - PRIORITY = round(model(layer impacts, layer sentiments), 2)
+          (GAP × IMPACT for the default "v1" model)
     Returns a dict with per-dimension detail and a sorted list of priorities.
     """
+    if model not in SCORING_MODELS:
+        raise ValueError(f"Unknown scoring model: {model!r} (known: {sorted(SCORING_MODELS)})")
+    scorer = SCORING_MODELS[model]
     layers = {
         "canonical": canonical,
         "corpus": corpus,
@@ -46,7 +97,7 @@ def compute_priorities(
         impacts = list(layer_impacts.values())
         gap = float(max(impacts) - min(impacts)) if impacts else 0.0
         impact_mean = float(sum(impacts) / len(impacts)) if impacts else 0.0
-        priority = round(gap * impact_mean, 2)
+        priority = round(float(scorer(np.array(impacts), np.array(list(layer_sents.values())))), 2)
 
         dim_results[dim] = {
             "layer_impacts": layer_impacts,
@@ -62,4 +113,99 @@ def compute_priorities(
         key=lambda x: x["priority"],
         reverse=True
     )
-    return {"by_dimension": dim_results, "ranked": ranked}
+    return {"by_dimension": dim_results, "ranked": ranked, "version": model}
+
+
+def get_scorer(version: str = SCORING_VERSION) -> Callable[[LayerOutput, LayerOutput, LayerOutput], Dict[str, Any]]:
+    """Return a `compute_priorities` bound to the scoring model registered as `version`."""
+    if version not in SCORING_MODELS:
+        raise ValueError(f"Unknown scoring version: {version!r} (known: {sorted(SCORING_MODELS)})")
+    return partial(compute_priorities, model=version)
+
+
+def _item_arrays(layers: List[LayerOutput]):
+    """Pack items into padded (dimension, layer, item) arrays plus a validity mask."""
+    width = max(
+        (len(getattr(layer, dim)) for layer in layers for dim in DIMENSIONS),
+        default=0,
+    ) or 1
+    shape = (len(DIMENSIONS), len(layers), width)
+    impacts = np.zeros(shape)
+    sentiments = np.zeros(shape)
+    mask = np.zeros(shape, dtype=bool)
+    for d, dim in enumerate(DIMENSIONS):
+        for l, layer in enumerate(layers):
+            for i, item in enumerate(getattr(layer, dim)):
+                impacts[d, l, i] = item.impact
+                sentiments[d, l, i] = item.sentiment
+                mask[d, l, i] = True
+    return impacts, sentiments, mask
+
+
+def sensitivity_analysis(
+    canonical: LayerOutput,
+    corpus: LayerOutput,
+    transactional: LayerOutput,
+    model: str = SCORING_VERSION,
+    samples: int = 2000,
+    impact_sigma: float = 1.0,
+    sentiment_sigma: float = 0.2,
+    ci: float = 0.95,
+    seed: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Monte Carlo stability of the priority ranking under noisy LLM scores.
+        - Every item's impact gets N(0, impact_sigma) noise (clipped to 1..10)
+          and its sentiment N(0, sentiment_sigma) noise (clipped to -1..1)
+        - All samples are scored in one vectorized pass through the scoring model
+    Returns per-dimension mean priority, confidence interval, rank distribution and
+    probability of ranking first, plus the share of samples reproducing the baseline order.
+    """
+    if model not in SCORING_MODELS:
+        raise ValueError(f"Unknown scoring model: {model!r} (known: {sorted(SCORING_MODELS)})")
+    scorer = SCORING_MODELS[model]
+    rng = np.random.default_rng(seed)
+
+    impacts, sentiments, mask = _item_arrays([canonical, corpus, transactional])
+    counts = mask.sum(axis=-1)  # (dim, layer)
+    safe_counts = np.maximum(counts, 1)
+
+    def layer_means(values: np.ndarray) -> np.ndarray:
+        return np.where(mask, values, 0.0).sum(axis=-1) / safe_counts
+
+    baseline = scorer(layer_means(impacts), layer_means(sentiments))  # (dim,)
+
+    noisy_impacts = np.clip(impacts + rng.normal(0.0, impact_sigma, (samples, *impacts.shape)), 1, 10)
+    noisy_sents = np.clip(sentiments + rng.normal(0.0, sentiment_sigma, (samples, *sentiments.shape)), -1, 1)
+    priorities = scorer(layer_means(noisy_impacts), layer_means(noisy_sents))  # (samples, dim)
+
+    # rank 1 = highest priority; stable sort keeps DIMENSIONS order on ties like `sorted`
+    order = np.argsort(-priorities, axis=-1, kind="stable")
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, np.arange(1, len(DIMENSIONS) + 1)[None, :], axis=-1)
+    baseline_order = np.argsort(-baseline, kind="stable")
+
+    lo, hi = np.quantile(priorities, [(1 - ci) / 2, 1 - (1 - ci) / 2], axis=0)
+    by_dimension = {}
+    for d, dim in enumerate(DIMENSIONS):
+        rank_counts = np.bincount(ranks[:, d], minlength=len(DIMENSIONS) + 1)[1:]
+        by_dimension[dim] = {
+            "baseline_priority": round(float(baseline[d]), 2),
+            "baseline_rank": int(np.where(baseline_order == d)[0][0]) + 1,
+            "mean_priority": round(float(priorities[:, d].mean()), 3),
+            "ci_low": round(float(lo[d]), 3),
+            "ci_high": round(float(hi[d]), 3),
+            "p_top": round(float(rank_counts[0] / samples), 4),
+            "rank_distribution": [round(float(c / samples), 4) for c in rank_counts],
+        }
+
+    return {
+        "model": model,
+        "samples": samples,
+        "impact_sigma": impact_sigma,
+        "sentiment_sigma": sentiment_sigma,
+        "ci": ci,
+        "rank_stability": round(float((order == baseline_order).all(axis=-1).mean()), 4),
+        "top_stability": round(float((order[:, 0] == baseline_order[0]).mean()), 4),
+        "by_dimension": by_dimension,
+    }
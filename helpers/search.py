@@ -0,0 +1,188 @@
+"""Full-text search over historical SWOT items (SQLite FTS5, BM25 ranking)."""
+
+import json
+import re
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .cache import replace_sqlite, store_lock
+from .models import RunSummary
+from .scoring import DIMENSIONS, LAYERS
+
+SEARCH_DB = "search.sqlite3"
+
+_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS items USING fts5(
+    text,
+    run_id UNINDEXED,
+    company UNINDEXED,
+    layer UNINDEXED,
+    dimension UNINDEXED,
+    impact UNINDEXED,
+    timestamp UNINDEXED,
+    tokenize = 'porter unicode61'
+);
+CREATE TABLE IF NOT EXISTS indexed_runs (run_id TEXT PRIMARY KEY);
+-- rowid span of each run's items, so re-indexing a run deletes by rowid instead of scanning
+CREATE TABLE IF NOT EXISTS run_rowids (run_id TEXT PRIMARY KEY, lo INTEGER NOT NULL, hi INTEGER NOT NULL);
+"""
+
+
+def _connect(data_dir: Path, name: str = SEARCH_DB) -> sqlite3.Connection:
+    conn = sqlite3.connect(data_dir / name, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _rows(summary: RunSummary):
+    for lname in LAYERS:
+        layer = getattr(summary, lname)
+        for dim in DIMENSIONS:
+            for item in getattr(layer, dim):
+                yield (item.text, summary.run_id, summary.company, lname, dim, item.impact, summary.timestamp)
+
+
+def _max_rowid(conn: sqlite3.Connection) -> int:
+    row = conn.execute("SELECT rowid FROM items ORDER BY rowid DESC LIMIT 1").fetchone()
+    return row[0] if row else 0
+
+
+def _delete_run(conn: sqlite3.Connection, run_id: str) -> None:
+    span = conn.execute("SELECT lo, hi FROM run_rowids WHERE run_id = ?", (run_id,)).fetchone()
+    if span is not None:
+        conn.execute("DELETE FROM items WHERE rowid BETWEEN ? AND ? AND run_id = ?", (*span, run_id))
+    else:  # indexed before rowid spans were recorded
+        conn.execute("DELETE FROM items WHERE run_id = ?", (run_id,))
+    conn.execute("DELETE FROM run_rowids WHERE run_id = ?", (run_id,))
+
+
+def _insert_run(conn: sqlite3.Connection, summary: RunSummary) -> None:
+    """(Re)index one run's items, replacing anything indexed under its run_id. Caller owns the transaction."""
+    cur = conn.execute("INSERT OR IGNORE INTO indexed_runs (run_id) VALUES (?)", (summary.run_id,))
+    if cur.rowcount == 0:
+        _delete_run(conn, summary.run_id)
+    lo = _max_rowid(conn) + 1
+    conn.executemany(
+        "INSERT INTO items (text, run_id, company, layer, dimension, impact, timestamp) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        _rows(summary),
+    )
+    hi = _max_rowid(conn)
+    if hi >= lo:
+        conn.execute("INSERT INTO run_rowids (run_id, lo, hi) VALUES (?, ?, ?)", (summary.run_id, lo, hi))
+
+
+def index_runs(summaries: List[RunSummary], data_dir: Path) -> None:
+    """Index persisted runs' items (replacing earlier versions) in one transaction."""
+    conn = _connect(data_dir)
+    try:
+        with conn:
+            for summary in summaries:
+                _insert_run(conn, summary)
+    finally:
+        conn.close()
+
+
+def index_run(summary: RunSummary, data_dir: Path) -> None:
+    """Add a newly persisted run's items to the search index."""
+    index_runs([summary], data_dir)
+
+
+def rebuild_search_index(data_dir: Path, batch_size: int = 500) -> Dict[str, int]:
+    """
+    Regenerate the search index from the stored runs into a temp file, then swap it in
+    under store_lock. Runs written during the build are re-indexed first; the live index
+    keeps serving (and taking writes) until the swap.
+    """
+    from .persistence import iter_run_paths
+
+    tmp_name = SEARCH_DB + ".rebuild"
+    for suffix in ("", "-wal", "-shm"):
+        (data_dir / (tmp_name + suffix)).unlink(missing_ok=True)
+    started = time.time()
+    conn = _connect(data_dir, tmp_name)
+    runs = 0
+    try:
+        for path in iter_run_paths(data_dir):
+            with open(path, "r", encoding="utf-8") as f:
+                _insert_run(conn, RunSummary(**json.load(f)))
+            runs += 1
+            if runs % batch_size == 0:
+                conn.commit()
+        conn.commit()
+        with store_lock(data_dir):
+            for path in iter_run_paths(data_dir):
+                if path.stat().st_mtime >= started - 1:
+                    with open(path, "r", encoding="utf-8") as f:
+                        _insert_run(conn, RunSummary(**json.load(f)))
+            conn.commit()
+            runs = conn.execute("SELECT count(*) FROM indexed_runs").fetchone()[0]
+            conn.execute("INSERT INTO items (items) VALUES ('optimize')")
+            conn.commit()
+            items = conn.execute("SELECT count(*) FROM items").fetchone()[0]
+            conn.close()
+            replace_sqlite(data_dir / tmp_name, data_dir / SEARCH_DB)
+    finally:
+        conn.close()
+    return {"runs": runs, "items": items}
+
+
+def _match_expression(q: str) -> str:
+    """Turn free text into an FTS5 OR-query of quoted terms (no operator injection)."""
+    terms = re.findall(r"\w+", q)
+    return " OR ".join(f'"{t}"' for t in terms)
+
+
+def search_items(
+    data_dir: Path,
+    q: str,
+    dimension: Optional[str] = None,
+    layer: Optional[str] = None,
+    company: Optional[str] = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> Dict[str, Any]:
+    """
+    BM25-ranked search over every indexed SWOT item.
+    Any query term may match; items matching more (and rarer) terms rank higher.
+    Returns the total number of matches and one page of hits.
+    """
+    match = _match_expression(q)
+    if not match or not (data_dir / SEARCH_DB).exists():
+        return {"query": q, "total": 0, "limit": limit, "offset": offset, "results": []}
+
+    where = ["items MATCH ?"]
+    params: list = [match]
+    if dimension:
+        where.append("dimension = ?")
+        params.append(dimension.lower())
+    if layer:
+        where.append("layer = ?")
+        params.append(layer.lower())
+    if company:
+        where.append("company = ?")
+        params.append(company)
+    clause = " AND ".join(where)
+
+    conn = _connect(data_dir)
+    try:
+        total = conn.execute(f"SELECT count(*) FROM items WHERE {clause}", params).fetchone()[0]
+        rows = conn.execute(
+            f"SELECT text, run_id, company, layer, dimension, impact, timestamp, bm25(items) AS score "
+            f"FROM items WHERE {clause} ORDER BY score LIMIT ? OFFSET ?",
+            params + [limit, offset],
+        ).fetchall()
+    finally:
+        conn.close()
+
+    results = [
+        {
+            "text": r[0], "run_id": r[1], "company": r[2], "layer": r[3],
+            "dimension": r[4], "impact": r[5], "timestamp": r[6],
+            "score": round(-r[7], 4),  # bm25() is lower-is-better; flip for readability
+        }
+        for r in rows
+    ]
+    return {"query": q, "total": total, "limit": limit, "offset": offset, "results": results}
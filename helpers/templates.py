@@ -28,8 +28,42 @@ FORM_HTML = """
     .error { display:block; background:#f8d7da; color:#721c24;}
   </style>
   <script>
+    // Speculative drafts: each layer is posted to /api/draft once its inputs stop changing,
+    // so extraction is already running (or done) by the time the form is submitted.
+    const DRAFT_DELAY_MS = 1200;
+    const DRAFT_FIELDS = {
+      layer_canonical: ['canonical'], strengths: ['canonical'], weaknesses: ['canonical'],
+      opportunities: ['canonical'], threats: ['canonical'],
+      layer_corpus: ['corpus'], layer_transactional: ['transactional'],
+      company_name: ['canonical', 'corpus', 'transactional'],
+      desired_outcomes: ['canonical', 'corpus', 'transactional'],
+    };
+    const draftTimers = {};
+    const draftRequests = {};
+
+    function scheduleDraft(layer){
+      clearTimeout(draftTimers[layer]);
+      draftTimers[layer] = setTimeout(() => sendDraft(layer), DRAFT_DELAY_MS);
+    }
+
+    function sendDraft(layer){
+      if(draftRequests[layer]) draftRequests[layer].abort();
+      const ctrl = new AbortController();
+      draftRequests[layer] = ctrl;
+      const fd = new FormData(document.getElementById('swotForm'));
+      fd.append('layer', layer);
+      fetch('/api/draft', { method:'POST', body: fd, signal: ctrl.signal }).catch(() => {});
+    }
+
+    document.addEventListener('DOMContentLoaded', () => {
+      document.getElementById('swotForm').addEventListener('input', (evt) => {
+        (DRAFT_FIELDS[evt.target.name] || []).forEach(scheduleDraft);
+      });
+    });
+
     function onSubmit(evt){
       evt.preventDefault();
+      Object.values(draftTimers).forEach(clearTimeout);
       const form = evt.target;
       const status = document.getElementById('status');
       status.className = 'status loading';
@@ -39,7 +73,13 @@ FORM_HTML = """
 
       const fd = new FormData(form);
       fetch('/analyze', { method:'POST', body: fd })
-        .then(r => { if(!r.ok) throw new Error('Network error'); return r.text(); })
+        .then(r => {
+          if(r.status === 429 || r.status === 503){
+            throw new Error('Server is busy, please retry in ' + (r.headers.get('Retry-After') || 'a few') + ' seconds');
+          }
+          if(!r.ok) throw new Error('Network error');
+          return r.text();
+        })
         .then(html => { document.open(); document.write(html); document.close(); })
         .catch(err => {
           status.className = 'status error';
@@ -66,6 +106,7 @@ FORM_HTML = """
         document.getElementsByName('opportunities')[0].value = 'AI nutrition trend gaining mainstream adoption\\nApple Vision platform early mover advantage\\nPartnership with bodybuilding gyms and coaches\\nInfluencer marketing in fitness YouTube/Instagram space\\nB2B licensing to personal trainers\\nExpand to Android to double addressable market\\nLeverage existing users for testimonial marketing\\nSEO/ASO optimization to improve App Store visibility\\nIntegration with Apple Health and fitness trackers';
 
         document.getElementsByName('threats')[0].value = 'Established competitors with massive user bases (MyFitnessPal 50M+)\\nLow rating count signals lack of traction to potential users\\nFitness app market saturation and high churn rates\\nAI feature commoditization - competitors adding similar tools\\nApple policy changes affecting IAP or data collection\\nRising API costs for AI chat functionality\\nUser preference shift toward free/ad-supported models\\nNiche "serious athletes only" positioning limits TAM\\nStale reviews (18 months old) harm conversion rates';
+        ['canonical', 'corpus', 'transactional'].forEach(scheduleDraft);
       } else {
         document.getElementsByName('company_name')[0].value = '';
         document.getElementsByName('desired_outcomes')[0].value = '';
@@ -86,7 +127,7 @@ FORM_HTML = """
     <p class="muted">This version adds Canonical / Corpus / Transactional layers, structured JSON from the LLM, and a Gap × Impact priority model. It also exposes a JSON API for downstream dashboards.</p>
   </div>
 
-  <form class="card" onsubmit="onSubmit(event)">
+  <form id="swotForm" class="card" onsubmit="onSubmit(event)">
     <div style="margin-bottom:20px; padding:12px; background:#e0f2fe; border-radius:6px;">
       <label style="display:flex; align-items:center; cursor:pointer; margin:0;">
         <input type="checkbox" onchange="togglePrefill(this.checked)" style="width:auto; margin-right:8px;">
@@ -131,6 +172,11 @@ FORM_HTML = """
       </div>
     </div>
 
+    <label style="display:flex; align-items:center; cursor:pointer; font-weight:normal;">
+      <input type="checkbox" name="reuse_prior" value="true" style="width:auto; margin-right:8px;">
+      Reuse prior extractions for near-duplicate layer notes (skips the LLM for those layers)
+    </label>
+
     <div id="status" class="status"></div>
     <br>
     <button id="submitBtn" class="btn" type="submit">Analyze</button>
@@ -579,6 +625,26 @@ def generate_visualization_html(summary: RunSummary) -> str:
     """
 
 
+def _render_reuse_card(summary: RunSummary) -> str:
+    """Near-duplicate matches for this run's layer inputs (empty when there were none)."""
+    layers = summary.reuse.get("layers") or {}
+    if not layers:
+        return ""
+    rows = ''.join([
+        f"<tr><td><b>{layer.title()}</b></td><td><code>{m['run_id']}</code></td>"
+        f"<td>{m['similarity']:.2f}</td><td>{'Reused' if m['reused'] else 'Re-extracted'}</td></tr>"
+        for layer, m in layers.items()
+    ])
+    return f"""
+  <div class="card">
+    <h2>Near-Duplicate Inputs <span class="pill">hit rate {summary.reuse.get('hit_rate', 0):.0%}</span></h2>
+    <table>
+      <tr><th>Layer</th><th>Prior Run</th><th>Similarity</th><th>Extraction</th></tr>
+      {rows}
+    </table>
+  </div>"""
+
+
 def generate_results_html(summary: RunSummary, viz_html: str) -> str:
     """Generate complete results page HTML."""
     pretty_json = json.dumps(summary.model_dump(), indent=2)
@@ -632,6 +698,8 @@ def generate_results_html(summary: RunSummary, viz_html: str) -> str:
       <a class="btn" href="/">← New Analysis</a>
       &nbsp;&nbsp;
       <a class="btn" href="/api/result?id={summary.run_id}">View JSON API</a>
+      &nbsp;&nbsp;
+      <a class="btn" href="/results/{summary.run_id}.pdf">Download PDF</a>
     </p>
   </div>
 
@@ -646,6 +714,8 @@ def generate_results_html(summary: RunSummary, viz_html: str) -> str:
     </table>
   </div>
 
+  {_render_reuse_card(summary)}
+
   {viz_html}
 
   <div class="card">
@@ -1,24 +1,72 @@
+import asyncio
+import io
 import os
+import secrets
+import tempfile
+import uuid
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Optional
 
 from dotenv import load_dotenv
-from fastapi import FastAPI, Form, Query
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi import BackgroundTasks, FastAPI, Form, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, StreamingResponse
 
 # LangChain / OpenAI (swap model or provider if you want)
 from langchain_openai import ChatOpenAI
 
 # Import from helpers
 from helpers import (
+    DIMENSIONS,
+    EXPORT_FORMATS,
     FORM_HTML,
+    LAYERS,
+    SCORING_VERSION,
+    AdmissionController,
+    ClientDisconnected,
+    DraftExtractor,
+    ModelRouter,
+    Overloaded,
+    RescoreInProgress,
     RunSummary,
+    SharedCache,
+    aprompt_layer_to_json,
+    cached_report,
+    cancel_on_disconnect,
+    compact_layer_input,
+    company_trend,
     compute_priorities,
+    count_tokens,
+    draft_key,
+    find_near_duplicate,
     generate_results_html,
     generate_visualization_html,
-    load_run,
+    get_scorer,
+    import_jsonl,
+    invalidate_report,
+    is_valid_run_id,
+    iter_export_runs,
+    layer_fingerprint_text,
+    load_run_cached,
+    ndjson_stream,
+    parquet_available,
+    parquet_stream,
+    pdf_available,
     persist_run,
-    prompt_layer_to_json,
+    render_report_file,
+    report_path,
+    rescore_runs,
+    reserve_rescore,
+    run_id_slug,
+    search_items,
+    session_secret,
+    sensitivity_analysis,
+    sign_session,
+    store_generation,
+    verify_session,
+    warm_tokenizer,
 )
 
 # ------------------------------------------------------------------------------
@@ -27,11 +75,28 @@ from helpers import (
 load_dotenv(override=True)
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL")  # e.g. http://localhost:9000/v1 for tools/mock_openai.py
 
 if not OPENAI_API_KEY:
     raise RuntimeError("Missing OPENAI_API_KEY env var.")
 
-llm = ChatOpenAI(model=MODEL, api_key=OPENAI_API_KEY, temperature=0)
+
+def make_llm(model: str) -> ChatOpenAI:
+    return ChatOpenAI(model=model, api_key=OPENAI_API_KEY, base_url=OPENAI_BASE_URL, temperature=0)
+
+
+# Model routing per layer (OPENAI_MODEL_<LAYER>) and input size (OPENAI_MODEL_LARGE at
+# LARGE_INPUT_TOKENS+). MODEL_SELECTOR=on tries the fastest OPENAI_MODEL_LADDER model first
+# and falls back to stronger ones when the output fails validation.
+llm = ModelRouter(
+    make_llm,
+    default_model=MODEL,
+    layer_models={layer: os.getenv(f"OPENAI_MODEL_{layer.upper()}") for layer in ("canonical", "corpus", "transactional")},
+    large_model=os.getenv("OPENAI_MODEL_LARGE"),
+    large_input_tokens=int(os.getenv("LARGE_INPUT_TOKENS", "1000")),
+    ladder=[m.strip() for m in os.getenv("OPENAI_MODEL_LADDER", MODEL).split(",") if m.strip()],
+    select=os.getenv("MODEL_SELECTOR", "off") == "on",
+)
 
 app = FastAPI(title="SWOT DCIF Engine (v2)")
 
@@ -40,18 +105,128 @@ DATA_DIR.mkdir(exist_ok=True)
 
 CSV_FILE = DATA_DIR / "swot_runs.csv"
 
+# Near-duplicate layer inputs: "auto" reuses prior extractions, "offer" reports them, "off" skips lookup
+NEAR_DUP_MODE = os.getenv("NEAR_DUP_MODE", "offer")
+NEAR_DUP_THRESHOLD = float(os.getenv("NEAR_DUP_THRESHOLD", "0.85"))
+
+# Prompt compaction: max tokens of notes + seeds sent per layer (PROMPT_TOKEN_BUDGET_<LAYER> overrides)
+LAYER_TOKEN_BUDGETS = {
+    layer: int(os.getenv(f"PROMPT_TOKEN_BUDGET_{layer.upper()}", os.getenv("PROMPT_TOKEN_BUDGET", "1500")))
+    for layer in ("canonical", "corpus", "transactional")
+}
+
+# Backpressure for /analyze: concurrent analyses, queued analyses, max seconds queued
+analysis_admission = AdmissionController(
+    max_concurrency=int(os.getenv("ANALYZE_MAX_CONCURRENCY", "8")),
+    max_queue=int(os.getenv("ANALYZE_MAX_QUEUE", "16")),
+    queue_timeout=float(os.getenv("ANALYZE_QUEUE_TIMEOUT", "20")),
+)
+
+# Caches shared by every uvicorn worker on the host (per-process LRU in front of SQLite).
+# Runs are versioned by file mtime; query results by the store generation persist_run bumps.
+CACHE_LOCAL_ENTRIES = int(os.getenv("CACHE_LOCAL_ENTRIES", "1024"))
+run_cache = SharedCache(DATA_DIR, "runs", max_local=CACHE_LOCAL_ENTRIES, model=RunSummary)
+query_cache = SharedCache(DATA_DIR, "queries", max_local=CACHE_LOCAL_ENTRIES)
+
+# Speculative extraction: the form posts each layer to /api/draft as it settles, so /analyze
+# finds most layers already extracted. Capped per signed browser session, per client address
+# and overall (calls per hour).
+SPECULATIVE_DRAFTS = os.getenv("SPECULATIVE_DRAFTS", "on") != "off"
+drafts = DraftExtractor(
+    ttl=float(os.getenv("DRAFT_TTL", "300")),
+    max_per_session=int(os.getenv("DRAFT_MAX_PER_SESSION", "20")),
+    max_per_client=int(os.getenv("DRAFT_MAX_PER_CLIENT", "60")),
+    max_total=int(os.getenv("DRAFT_MAX_TOTAL", "500")),
+    window=3600.0,
+    max_concurrency=int(os.getenv("DRAFT_MAX_CONCURRENCY", "4")),
+    shared=SharedCache(DATA_DIR, "drafts", max_local=256),
+)
+SESSION_COOKIE = "swot_session"
+SESSION_SECRET = session_secret(DATA_DIR)
+
+
+# Re-scoring started from the API shares the host with request handling: leave it half the CPUs
+RESCORE_WORKERS = int(os.getenv("RESCORE_WORKERS", str(max(1, (os.cpu_count() or 1) // 2))))
+
+# PDF rendering is CPU-bound: keep it in a process pool, off the event loop
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+_pdf_pool: Optional[ProcessPoolExecutor] = None
+pdf_renders: dict = {}  # run_id -> in-flight render future
+
+
+def get_pdf_pool() -> ProcessPoolExecutor:
+    global _pdf_pool
+    if _pdf_pool is None:
+        _pdf_pool = ProcessPoolExecutor(max_workers=PDF_WORKERS)
+    return _pdf_pool
+
+
+@app.on_event("startup")
+async def load_tokenizer():
+    # tiktoken may fetch its encoding on first use: do it before serving, off the event loop
+    await run_in_threadpool(warm_tokenizer)
+
+
+@app.on_event("shutdown")
+def shutdown_pdf_pool():
+    if _pdf_pool is not None:
+        _pdf_pool.shutdown(cancel_futures=True)
+
+
+@app.exception_handler(Overloaded)
+async def overloaded_handler(request: Request, exc: Overloaded):
+    return JSONResponse(
+        {"error": exc.detail, "retry_after": exc.retry_after},
+        status_code=exc.status_code,
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+def parse_seed(strengths: str, weaknesses: str, opportunities: str, threats: str) -> dict:
+    """Canonical quadrant seeds, one item per non-empty line."""
+    return {
+        "strengths": [s.strip() for s in strengths.splitlines() if s.strip()],
+        "weaknesses": [s.strip() for s in weaknesses.splitlines() if s.strip()],
+        "opportunities": [s.strip() for s in opportunities.splitlines() if s.strip()],
+        "threats": [s.strip() for s in threats.splitlines() if s.strip()],
+    }
+
+
+def prepare_layer(layer: str, raw: str, seed: dict, company_name: str, desired_outcomes: str):
+    """Compact a layer's notes and key the resulting prompt (shared by /analyze and /api/draft)."""
+    key = layer.lower()
+    compacted = compact_layer_input(raw, seed, LAYER_TOKEN_BUDGETS[key])
+    # If a layer is empty, provide a minimal nudge so the LLM returns []
+    notes = compacted.text.strip() or f"No {key} notes provided."
+    model, _ = llm.route(key, count_tokens(notes))
+    return compacted, notes, draft_key(key, company_name, desired_outcomes, notes, compacted.seed, model)
+
+
+def client_address(request: Request) -> str:
+    return request.client.host if request.client else "anonymous"
+
+
+def session_id(request: Request) -> str:
+    """Token of a validly signed session cookie; unsigned or forged cookies fall back to the client address."""
+    return verify_session(request.cookies.get(SESSION_COOKIE, ""), SESSION_SECRET) or client_address(request)
+
 
 # ------------------------------------------------------------------------------
 # Routes
 # ------------------------------------------------------------------------------
 
 @app.get("/", response_class=HTMLResponse)
-def home():
-    return FORM_HTML
+def home(request: Request):
+    response = HTMLResponse(FORM_HTML)
+    if verify_session(request.cookies.get(SESSION_COOKIE, ""), SESSION_SECRET) is None:
+        token = sign_session(secrets.token_urlsafe(16), SESSION_SECRET)
+        response.set_cookie(SESSION_COOKIE, token, httponly=True, samesite="lax")
+    return response
 
 
 @app.post("/analyze", response_class=HTMLResponse)
-def analyze(
+async def analyze(
+    request: Request,
     company_name: str = Form(...),
     desired_outcomes: str = Form(...),
     layer_canonical: str = Form(""),
@@ -61,52 +236,86 @@ def analyze(
     weaknesses: str = Form(""),
     opportunities: str = Form(""),
     threats: str = Form(""),
+    reuse_prior: bool = Form(False),
 ):
     # Parse canonical quadrant seeds (optional)
-    canonical_seed = {
-        "strengths": [s.strip() for s in strengths.splitlines() if s.strip()],
-        "weaknesses": [s.strip() for s in weaknesses.splitlines() if s.strip()],
-        "opportunities": [s.strip() for s in opportunities.splitlines() if s.strip()],
-        "threats": [s.strip() for s in threats.splitlines() if s.strip()],
-    }
+    canonical_seed = parse_seed(strengths, weaknesses, opportunities, threats)
 
-    # If a layer is empty, provide a minimal nudge so the LLM returns []
-    def safe_text(txt: str, fallback: str) -> str:
-        return txt.strip() if txt.strip() else fallback
-
-    canonical_out = prompt_layer_to_json(
-        llm,
-        "Canonical", company_name, desired_outcomes,
-        safe_text(layer_canonical, "No canonical notes provided."),
-        canonical_seed
-    )
-    corpus_out = prompt_layer_to_json(
-        llm,
-        "Corpus", company_name, desired_outcomes,
-        safe_text(layer_corpus, "No corpus notes provided."),
-        canonical_seed={}
-    )
-    transactional_out = prompt_layer_to_json(
-        llm,
-        "Transactional", company_name, desired_outcomes,
-        safe_text(layer_transactional, "No transactional notes provided."),
-        canonical_seed={}
-    )
+    # Near-duplicate reuse: "auto" reuses prior extractions, "offer" only reports them
+    reuse_mode = "auto" if reuse_prior else NEAR_DUP_MODE
+    reuse_layers = {}
+    layer_inputs = {}
+    compaction = {}
+    drafted = []
 
-    priorities = compute_priorities(canonical_out, corpus_out, transactional_out)
-
-    run_id = f"{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S')}_{company_name.replace(' ', '_')}"
-    summary = RunSummary(
-        run_id=run_id,
-        timestamp=datetime.now(timezone.utc).isoformat(),
-        company=company_name,
-        desired_outcomes=desired_outcomes,
-        canonical=canonical_out,
-        corpus=corpus_out,
-        transactional=transactional_out,
-        priorities=priorities
-    )
-    persist_run(summary, DATA_DIR, CSV_FILE)
+    async def extract(layer: str, raw: str, seed: dict):
+        key = layer.lower()
+        fingerprint = layer_fingerprint_text(desired_outcomes, raw.strip(), seed) if raw.strip() else ""
+        layer_inputs[key] = fingerprint
+        match = None
+        if reuse_mode != "off" and fingerprint:
+            match = await run_in_threadpool(
+                find_near_duplicate, key, company_name, fingerprint, DATA_DIR, NEAR_DUP_THRESHOLD
+            )
+        if match:
+            prior = await run_in_threadpool(load_run_cached, match[0], DATA_DIR, run_cache)
+            reused = reuse_mode == "auto" and prior is not None
+            reuse_layers[key] = {"run_id": match[0], "similarity": match[1], "reused": reused}
+            if reused:
+                out = getattr(prior, key).model_copy(deep=True)
+                out.company = company_name
+                out.desired_outcomes = desired_outcomes
+                return out
+        compacted, notes, prompt_key = prepare_layer(layer, raw, seed, company_name, desired_outcomes)
+        compaction[key] = compacted.stats
+        if SPECULATIVE_DRAFTS:
+            out = await drafts.take(prompt_key)
+            if out is not None:
+                drafted.append(key)
+                return out
+        return await aprompt_layer_to_json(llm, layer, company_name, desired_outcomes, notes, compacted.seed)
+
+    async def run_analysis() -> RunSummary:
+        # The three layers are independent, so extract them concurrently
+        canonical_out, corpus_out, transactional_out = await asyncio.gather(
+            extract("Canonical", layer_canonical, canonical_seed),
+            extract("Corpus", layer_corpus, {}),
+            extract("Transactional", layer_transactional, {}),
+        )
+
+        priorities = compute_priorities(canonical_out, corpus_out, transactional_out)
+
+        # Random suffix: concurrent analyses for one company can finish within the same second
+        stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S')
+        run_id = f"{stamp}_{run_id_slug(company_name)}_{uuid.uuid4().hex[:8]}"
+        summary = RunSummary(
+            run_id=run_id,
+            timestamp=datetime.now(timezone.utc).isoformat(),
+            company=company_name,
+            desired_outcomes=desired_outcomes,
+            canonical=canonical_out,
+            corpus=corpus_out,
+            transactional=transactional_out,
+            priorities=priorities,
+            layer_inputs=layer_inputs,
+            reuse={
+                "mode": reuse_mode,
+                "threshold": NEAR_DUP_THRESHOLD,
+                "hit_rate": round(sum(l["reused"] for l in reuse_layers.values()) / 3, 3),
+                "layers": reuse_layers,
+            },
+            compaction=compaction,
+            drafted=drafted,
+        )
+        await run_in_threadpool(persist_run, summary, DATA_DIR, CSV_FILE)
+        return summary
+
+    # Bounded concurrency + queue; abandon LLM calls nobody will read
+    async with analysis_admission.slot():
+        try:
+            summary = await cancel_on_disconnect(request, run_analysis())
+        except ClientDisconnected:
+            return HTMLResponse("Client disconnected.", status_code=499)
 
     # Generate visualization
     viz_html = generate_visualization_html(summary)
@@ -116,14 +325,229 @@ def analyze(
     return HTMLResponse(html)
 
 
+@app.get("/api/admission", response_class=JSONResponse)
+def api_admission():
+    return JSONResponse(analysis_admission.stats())
+
+
+@app.post("/api/draft", response_class=JSONResponse)
+async def api_draft(
+    request: Request,
+    layer: str = Form(..., description="canonical | corpus | transactional"),
+    company_name: str = Form(""),
+    desired_outcomes: str = Form(""),
+    layer_canonical: str = Form(""),
+    layer_corpus: str = Form(""),
+    layer_transactional: str = Form(""),
+    strengths: str = Form(""),
+    weaknesses: str = Form(""),
+    opportunities: str = Form(""),
+    threats: str = Form(""),
+    reuse_prior: bool = Form(False),
+):
+    """Start extracting one layer of the form in the background; /analyze picks up the result."""
+    key = layer.lower()
+    if key not in LAYER_TOKEN_BUDGETS:
+        return JSONResponse({"error": f"Unknown layer: {layer}"}, status_code=400)
+    if not SPECULATIVE_DRAFTS:
+        return JSONResponse({"status": "disabled"})
+    raw = {"canonical": layer_canonical, "corpus": layer_corpus, "transactional": layer_transactional}[key]
+    if not (raw.strip() and company_name.strip() and desired_outcomes.strip()):
+        return JSONResponse({"status": "incomplete"})
+    if analysis_admission.waiting:
+        return JSONResponse({"status": "busy"})  # shed speculative work before real analyses
+
+    seed = parse_seed(strengths, weaknesses, opportunities, threats) if key == "canonical" else {}
+    if reuse_prior or NEAR_DUP_MODE == "auto":
+        fingerprint = layer_fingerprint_text(desired_outcomes, raw.strip(), seed)
+        match = await run_in_threadpool(
+            find_near_duplicate, key, company_name, fingerprint, DATA_DIR, NEAR_DUP_THRESHOLD
+        )
+        if match:
+            return JSONResponse({"status": "reusable", "run_id": match[0]})
+
+    compacted, notes, prompt_key = prepare_layer(key, raw, seed, company_name, desired_outcomes)
+    status = drafts.submit(
+        session_id(request), client_address(request), key, prompt_key,
+        lambda: aprompt_layer_to_json(llm, key.capitalize(), company_name, desired_outcomes, notes, compacted.seed),
+    )
+    return JSONResponse({"status": status}, status_code=202 if status == "started" else 200)
+
+
+@app.get("/api/drafts", response_class=JSONResponse)
+def api_drafts():
+    return JSONResponse(drafts.stats())
+
+
+@app.get("/api/models", response_class=JSONResponse)
+def api_models():
+    """Per-model calls, validation pass rate, latency percentiles and token usage (this worker)."""
+    return JSONResponse(llm.stats())
+
+
+@app.get("/api/cache", response_class=JSONResponse)
+def api_cache():
+    """Hit rates of this worker's view of the shared caches (pid tells workers apart)."""
+    return JSONResponse({
+        "generation": store_generation(DATA_DIR).value,
+        "caches": [run_cache.report(), query_cache.report()],
+    })
+
+
+@app.get("/results/{run_id}.pdf")
+async def results_pdf(run_id: str, refresh: bool = Query(False, description="Ignore the cached PDF")):
+    if not pdf_available():
+        return JSONResponse({"error": "PDF reports require reportlab (pip install reportlab)."}, status_code=501)
+    run_path = DATA_DIR / f"{run_id}.json"
+    if not is_valid_run_id(run_id) or not run_path.exists():
+        return JSONResponse({"error": "Run ID not found."}, status_code=404)
+
+    if refresh:
+        invalidate_report(run_id, DATA_DIR)
+    cached = cached_report(run_id, DATA_DIR)
+    if cached is None:
+        # Concurrent requests for the same report share one render
+        render = pdf_renders.get(run_id)
+        if render is None:
+            loop = asyncio.get_running_loop()
+            render = loop.run_in_executor(
+                get_pdf_pool(), render_report_file, str(run_path), str(report_path(run_id, DATA_DIR))
+            )
+            pdf_renders[run_id] = render
+            render.add_done_callback(lambda _: pdf_renders.pop(run_id, None))
+        cached = Path(await asyncio.shield(render))
+    return FileResponse(cached, media_type="application/pdf", filename=f"swot_{run_id}.pdf")
+
+
 @app.get("/api/result", response_class=JSONResponse)
 def api_result(id: str = Query(..., description="Run ID of the analysis")):
-    run = load_run(id, DATA_DIR)
+    run = load_run_cached(id, DATA_DIR, run_cache)
     if not run:
         return JSONResponse({"error": "Run ID not found."}, status_code=404)
     return JSONResponse(run.model_dump())
 
 
+@app.get("/api/companies/{name}/trend", response_class=JSONResponse)
+def api_company_trend(
+    name: str,
+    dimension: Optional[str] = Query(None, description="Restrict to one SWOT dimension"),
+):
+    if dimension is not None and dimension not in DIMENSIONS:
+        return JSONResponse({"error": f"Unknown dimension: {dimension}"}, status_code=400)
+    trend = query_cache.get_or_compute(
+        f"trend:{name}:{dimension}", store_generation(DATA_DIR).value,
+        lambda: company_trend(name, DATA_DIR, dimension),
+    )
+    if not trend:
+        return JSONResponse({"error": "No runs for this company."}, status_code=404)
+    return JSONResponse(trend)
+
+
+@app.get("/api/search", response_class=JSONResponse)
+def api_search(
+    q: str = Query(..., min_length=1, description="Search terms (any may match)"),
+    dimension: Optional[str] = Query(None, description="strengths | weaknesses | opportunities | threats"),
+    layer: Optional[str] = Query(None, description="canonical | corpus | transactional"),
+    company: Optional[str] = Query(None),
+    limit: int = Query(20, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+):
+    if dimension is not None and dimension.lower() not in DIMENSIONS:
+        return JSONResponse({"error": f"Unknown dimension: {dimension}"}, status_code=400)
+    if layer is not None and layer.lower() not in LAYERS:
+        return JSONResponse({"error": f"Unknown layer: {layer}"}, status_code=400)
+    key = f"search:{q}:{dimension}:{layer}:{company}:{limit}:{offset}"
+    results = query_cache.get_or_compute(
+        key, store_generation(DATA_DIR).value,
+        lambda: search_items(DATA_DIR, q, dimension, layer, company, limit, offset),
+    )
+    return JSONResponse(results)
+
+
+@app.get("/api/sensitivity", response_class=JSONResponse)
+def api_sensitivity(
+    id: str = Query(..., description="Run ID of the analysis"),
+    model: str = Query(SCORING_VERSION, description="Scoring model to stress"),
+    samples: int = Query(2000, ge=100, le=20000),
+    impact_sigma: float = Query(1.0, ge=0.0, le=5.0),
+    sentiment_sigma: float = Query(0.2, ge=0.0, le=1.0),
+    seed: Optional[int] = Query(None),
+):
+    run = load_run_cached(id, DATA_DIR, run_cache)
+    if not run:
+        return JSONResponse({"error": "Run ID not found."}, status_code=404)
+    try:
+        report = sensitivity_analysis(
+            run.canonical, run.corpus, run.transactional,
+            model=model, samples=samples,
+            impact_sigma=impact_sigma, sentiment_sigma=sentiment_sigma, seed=seed,
+        )
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    return JSONResponse({"run_id": id, **report})
+
+
+@app.get("/api/export")
+def api_export(
+    format: str = Query("ndjson", description="ndjson | parquet"),
+    since: Optional[str] = Query(None, description="Only runs with timestamp >= this ISO date/time"),
+    cursor: int = Query(0, ge=0, description="Resume after this _cursor value"),
+    limit: Optional[int] = Query(None, ge=1, description="Stop after this many runs"),
+):
+    if format not in EXPORT_FORMATS:
+        return JSONResponse({"error": f"Unknown format: {format}"}, status_code=400)
+    if format == "parquet" and not parquet_available():
+        return JSONResponse({"error": "Parquet export requires pyarrow (pip install pyarrow)."}, status_code=501)
+
+    records = iter_export_runs(DATA_DIR, CSV_FILE, since=since, cursor=cursor, limit=limit)
+    if format == "parquet":
+        return StreamingResponse(
+            parquet_stream(records),
+            media_type="application/vnd.apache.parquet",
+            headers={"Content-Disposition": 'attachment; filename="swot_runs.parquet"'},
+        )
+    return StreamingResponse(ndjson_stream(records), media_type="application/x-ndjson")
+
+
+@app.post("/api/import", response_class=JSONResponse)
+async def api_import(
+    request: Request,
+    batch_size: int = Query(500, ge=1, le=10000),
+    skip_existing: bool = Query(True, description="Skip runs whose run_id is already stored"),
+):
+    # Spool the JSONL body to disk so large backfills never sit in memory
+    with tempfile.TemporaryFile() as spool:
+        async for chunk in request.stream():
+            spool.write(chunk)
+        spool.seek(0)
+        lines = io.TextIOWrapper(spool, encoding="utf-8")
+        stats = await run_in_threadpool(
+            import_jsonl, lines, DATA_DIR, CSV_FILE, batch_size=batch_size, skip_existing=skip_existing
+        )
+    return JSONResponse(stats)
+
+
+@app.post("/api/rescore", response_class=JSONResponse)
+def api_rescore(
+    background_tasks: BackgroundTasks,
+    version: str = Query(SCORING_VERSION, description="Scoring version to apply"),
+    restart: bool = Query(False, description="Ignore the previous pass journal"),
+):
+    try:
+        get_scorer(version)
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    try:
+        # Taken here, not in the task, so a second request is refused instead of scheduled
+        held = reserve_rescore(DATA_DIR)
+    except RescoreInProgress:
+        return JSONResponse({"error": "A re-scoring pass is already running."}, status_code=409)
+    background_tasks.add_task(
+        rescore_runs, DATA_DIR, CSV_FILE, version=version, workers=RESCORE_WORKERS, resume=not restart, held=held
+    )
+    return JSONResponse({"status": "scheduled", "version": version}, status_code=202)
+
+
 # ------------------------------------------------------------------------------
 # Local Dev Entrypoint
 # ------------------------------------------------------------------------------
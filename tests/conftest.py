@@ -0,0 +1,36 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+@pytest.fixture
+def run_line():
+    """JSONL line for a whole RunSummary of "Imp Co" with one canonical strength."""
+    def make(run_id, text, notes=""):
+        layer = {"company": "Imp Co", "desired_outcomes": "grow"}
+        return json.dumps({
+            "run_id": run_id,
+            "timestamp": "2025-01-01T00:00:00+00:00",
+            "company": "Imp Co",
+            "desired_outcomes": "grow",
+            "canonical": {**layer, "layer": "Canonical",
+                          "strengths": [{"text": text, "impact": 7, "sentiment": 0.5}]},
+            "corpus": {**layer, "layer": "Corpus"},
+            "transactional": {**layer, "layer": "Transactional"},
+            "layer_inputs": {"canonical": notes} if notes else {},
+        })
+    return make
+
+
+@pytest.fixture
+def import_lines():
+    """`import_jsonl` into a data dir with its swot_runs.csv index, returning the stats."""
+    from helpers import import_jsonl
+
+    def run(data_dir, lines, **kwargs):
+        return import_jsonl(lines, data_dir, data_dir / "swot_runs.csv", **kwargs)
+    return run
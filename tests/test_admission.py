@@ -0,0 +1,33 @@
+"""Admission control under simultaneous arrivals."""
+
+import asyncio
+
+from helpers import AdmissionController, Overloaded
+
+
+async def _call(controller, hold):
+    async with controller.slot():
+        await asyncio.sleep(hold)
+
+
+def test_simultaneous_arrivals_beyond_queue_are_rejected_immediately():
+    async def scenario():
+        controller = AdmissionController(max_concurrency=1, max_queue=1, queue_timeout=5)
+        results = await asyncio.gather(*(_call(controller, 0.05) for _ in range(4)), return_exceptions=True)
+        return controller, results
+
+    controller, results = asyncio.run(scenario())
+    rejected = [r for r in results if isinstance(r, Overloaded)]
+    assert [r.status_code for r in rejected] == [429, 429]
+    assert sum(r is None for r in results) == 2
+    assert controller.rejected == {429: 2, 503: 0}
+
+
+def test_queue_timeout_gives_503():
+    async def scenario():
+        controller = AdmissionController(max_concurrency=1, max_queue=1, queue_timeout=0.05)
+        return await asyncio.gather(_call(controller, 0.3), _call(controller, 0), return_exceptions=True)
+
+    first, second = asyncio.run(scenario())
+    assert first is None
+    assert isinstance(second, Overloaded) and second.status_code == 503
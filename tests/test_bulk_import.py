@@ -0,0 +1,110 @@
+"""Replay / overwrite behaviour of the bulk import path and the derived stores it feeds."""
+
+import json
+
+import pandas as pd
+
+from helpers import find_near_duplicate, iter_export_runs, load_run, persist_run, search_items
+from helpers import persistence
+from helpers.rollups import load_company_rollup
+
+
+def _layer_lines(text):
+    return [
+        json.dumps({"layer": "Canonical", "company": "Imp Co", "desired_outcomes": "grow",
+                    "strengths": [{"text": text, "impact": 7, "sentiment": 0.5}]}),
+        json.dumps({"layer": "Corpus", "company": "Imp Co", "desired_outcomes": "grow"}),
+    ]
+
+
+def test_replay_is_idempotent(tmp_path, import_lines):
+    first = import_lines(tmp_path, _layer_lines("strong brand"))
+    second = import_lines(tmp_path, _layer_lines("strong brand"))
+
+    assert first["imported"] == 1
+    assert second == {**second, "imported": 0, "skipped_existing": 1}
+    assert len(list(tmp_path.glob("*.json"))) == 1
+    assert len(pd.read_csv(tmp_path / "swot_runs.csv")) == 1
+    assert load_company_rollup("Imp Co", tmp_path)["run_count"] == 1
+
+
+def test_overwrite_replaces_derived_rows(tmp_path, run_line, import_lines):
+    old_notes = "Alpha launch went well. Customers praise the onboarding flow and the pricing page."
+    new_notes = "Beta churn is rising. Support tickets mention crashes on older phones every week."
+    import_lines(tmp_path, [run_line("r1", "alpha feature", old_notes)])
+    stats = import_lines(tmp_path, [run_line("r1", "beta feature", new_notes)], skip_existing=False)
+
+    assert stats["imported"] == 1
+    assert load_run("r1", tmp_path).canonical.strengths[0].text == "beta feature"
+    index = pd.read_csv(tmp_path / "swot_runs.csv")
+    assert index["run_id"].tolist() == ["r1"]
+    rollup = load_company_rollup("Imp Co", tmp_path)
+    assert rollup["run_count"] == 1
+    assert all(agg["count"] == 1 and len(agg["series"]) == 1 for agg in rollup["dimensions"].values())
+    assert search_items(tmp_path, "beta")["total"] == 1
+    assert search_items(tmp_path, "alpha")["total"] == 0
+    assert find_near_duplicate("canonical", "Imp Co", new_notes, tmp_path, 0.9) == ("r1", 1.0)
+    assert find_near_duplicate("canonical", "Imp Co", old_notes, tmp_path, 0.9) is None
+
+
+def test_invalid_run_id_is_rejected(tmp_path, import_lines):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    line = json.dumps({"run_id": "../escaped", "layer": "Canonical", "company": "X", "desired_outcomes": "y"})
+    stats = import_lines(data_dir, [line])
+
+    assert stats["imported"] == 0 and stats["invalid"] == 1
+    assert "Invalid run_id" in stats["errors"][0]["error"]
+    assert not (tmp_path / "escaped.json").exists()
+
+
+def test_persisting_a_run_twice_counts_it_once(tmp_path, run_line, import_lines):
+    import_lines(tmp_path, [run_line("r1", "alpha feature")])
+    persist_run(load_run("r1", tmp_path), tmp_path, tmp_path / "swot_runs.csv")
+
+    assert load_company_rollup("Imp Co", tmp_path)["run_count"] == 1
+    assert len(pd.read_csv(tmp_path / "swot_runs.csv")) == 1
+
+
+def test_repeated_layer_starts_a_new_run(tmp_path, import_lines):
+    lines = [_layer_lines("first item")[0], _layer_lines("second item")[0]]
+    stats = import_lines(tmp_path, lines)
+
+    assert stats["imported"] == 2 and stats["invalid"] == 0
+    assert search_items(tmp_path, "first")["total"] == 1
+    assert search_items(tmp_path, "second")["total"] == 1
+
+
+def test_repeated_layer_under_one_run_id_is_invalid(tmp_path, run_line, import_lines):
+    line = json.dumps({"run_id": "r1", "layer": "Canonical", "company": "Imp Co", "desired_outcomes": "grow"})
+    stats = import_lines(tmp_path, [line, line])
+
+    assert stats["imported"] == 1 and stats["invalid"] == 1
+    assert "repeated" in stats["errors"][0]["error"]
+
+
+def test_overwrite_keeps_export_cursor_positions(tmp_path, run_line, import_lines):
+    import_lines(tmp_path, [run_line(f"r{i}", f"item {i}") for i in range(1, 5)])
+    *_, (cursor, _) = iter_export_runs(tmp_path, tmp_path / "swot_runs.csv", limit=3)
+    import_lines(tmp_path, [run_line("r1", "rewritten item")], skip_existing=False)
+
+    resumed = [run["run_id"] for _, run in iter_export_runs(tmp_path, tmp_path / "swot_runs.csv", cursor=cursor)]
+    assert cursor == 3 and resumed == ["r4"]
+
+
+def test_overwrite_fixes_rows_and_rollups_once_per_import(tmp_path, run_line, monkeypatch, import_lines):
+    import_lines(tmp_path, [run_line(f"r{i}", f"item {i}") for i in range(1, 5)])
+    rebuilds = []
+    rebuild = persistence._rebuild_company_rollups
+    monkeypatch.setattr(persistence, "_rebuild_company_rollups",
+                        lambda *args, **kwargs: rebuilds.append(args[1]) or rebuild(*args, **kwargs))
+    lines = [run_line(f"r{i}", f"new {i}") for i in range(1, 5)] + [run_line("r5", "item 5")]
+    stats = import_lines(tmp_path, lines, skip_existing=False, batch_size=2)
+
+    assert stats["batches"] == 3 and stats["replaced"] == 4
+    assert len(rebuilds) == 1
+    index = pd.read_csv(tmp_path / "swot_runs.csv")
+    assert index["run_id"].tolist() == ["r1", "r2", "r3", "r4", "r5"]
+    rollup = load_company_rollup("Imp Co", tmp_path)
+    assert rollup["run_count"] == 5
+    assert search_items(tmp_path, "item")["total"] == 1
@@ -0,0 +1,35 @@
+"""SharedCache L2 round-trips through JSON, never pickle."""
+
+import os
+import pickle
+
+from helpers import RunSummary, SharedCache, load_run_cached
+
+
+def test_models_and_plain_values_are_rebuilt_from_json(tmp_path, run_line, import_lines):
+    import_lines(tmp_path, [run_line("r1", "alpha feature")])
+    load_run_cached("r1", tmp_path, SharedCache(tmp_path, "runs", model=RunSummary))
+    SharedCache(tmp_path, "queries").set("q", 1, {"total": 1, "results": [{"text": "alpha"}]})
+
+    runs = SharedCache(tmp_path, "runs", model=RunSummary)  # another worker: empty L1
+    run = load_run_cached("r1", tmp_path, runs)
+    assert isinstance(run, RunSummary) and run.canonical.strengths[0].text == "alpha feature"
+    assert runs.stats["l2_hits"] == 1
+    assert SharedCache(tmp_path, "queries").get("q", 1) == {"total": 1, "results": [{"text": "alpha"}]}
+
+
+class _Payload:
+    def __reduce__(self):
+        return os.system, ("touch pwned",)
+
+
+def test_pickled_rows_are_never_unpickled(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cache = SharedCache(tmp_path, "queries")
+    cache.set("q", 1, {})
+    conn = cache._conn()
+    with conn:
+        conn.execute("UPDATE cache SET value = ? WHERE key = 'q'", (pickle.dumps(_Payload()),))
+
+    assert SharedCache(tmp_path, "queries").get("q", 1) is None
+    assert not (tmp_path / "pwned").exists()
@@ -0,0 +1,63 @@
+"""ItemTable round trips and vectorized scoring."""
+
+import numpy as np
+import pytest
+
+from helpers import SCORING_MODELS, ItemTable, LayerOutput, RunSummary, SWOTItem, compute_priorities
+from helpers.scoring import DIMENSIONS
+
+
+def _layer(name, items):
+    return LayerOutput(
+        layer=name, company="Imp Co", desired_outcomes="grow",
+        strengths=[SWOTItem(text=t, impact=i, sentiment=s) for t, i, s in items],
+        threats=[SWOTItem(text="rival", impact=3, sentiment=-0.25)],
+        run_metadata={"model": "gpt-4o-mini"},
+    )
+
+
+@pytest.fixture
+def runs():
+    result = []
+    for n in range(3):
+        layers = {
+            "canonical": _layer("Canonical", [("brand", 7 + n % 3, 0.5)]),
+            "corpus": _layer("Corpus", [("brand", 4, 0.25), ("fast sync", 9, 0.75)]),
+            "transactional": _layer("Transactional", []),
+        }
+        v1 = compute_priorities(*layers.values())
+        promoted = compute_priorities(*layers.values(), model="sentiment_gap")
+        result.append(RunSummary(
+            run_id=f"r{n}", timestamp=f"2025-01-0{n + 1}T00:00:00+00:00", company="Imp Co",
+            desired_outcomes="grow", priorities=promoted, scoring_version="sentiment_gap",
+            priorities_by_version={"v1": v1, "sentiment_gap": promoted},
+            layer_inputs={"canonical": "notes"}, reuse={"corpus": {"run_id": "r0"}},
+            compaction={"corpus": {"tokens_before": 10, "tokens_after": 8}}, drafted=["canonical"],
+            **layers,
+        ))
+    return result
+
+
+def test_run_summary_round_trips_through_the_table(runs):
+    table = ItemTable.from_runs(runs)
+    rebuilt = [table.to_run_summary(r) for r in range(table.num_runs)]
+    assert [r.model_dump() for r in rebuilt] == [r.model_dump() for r in runs]
+
+    again = ItemTable.from_runs(rebuilt)
+    assert [again.to_run_summary(r).model_dump() for r in range(again.num_runs)] == [r.model_dump() for r in runs]
+
+
+def test_items_only_table_rescores_and_drops_run_fields(runs):
+    table = ItemTable.from_runs(runs, run_fields=False)
+    rebuilt = table.to_run_summary(0)
+    assert rebuilt.scoring_version == "v1" and rebuilt.priorities == runs[0].priorities_by_version["v1"]
+    assert rebuilt.layer_inputs == {} and rebuilt.canonical.run_metadata == {}
+    assert rebuilt.canonical == runs[0].canonical.model_copy(update={"run_metadata": {}})
+
+
+@pytest.mark.parametrize("model", sorted(SCORING_MODELS))
+def test_vectorized_priorities_match_compute_priorities(runs, model):
+    expected = [[compute_priorities(r.canonical, r.corpus, r.transactional, model=model)["by_dimension"][d]["priority"]
+                 for d in DIMENSIONS] for r in runs]
+    # binary-fraction sentiments, so float32 storage is exact and results must match exactly
+    np.testing.assert_array_equal(ItemTable.from_runs(runs).priorities(model), expected)
@@ -0,0 +1,34 @@
+from helpers.compaction import compact_layer_input, count_tokens, render_seed
+
+
+def test_seed_kept_in_every_quadrant_it_was_listed_in():
+    out = compact_layer_input("", {"strengths": ["Loyal users", "loyal users!"], "threats": ["Loyal users"]})
+    assert out.seed["strengths"] == ["Loyal users"]
+    assert out.seed["threats"] == ["Loyal users"]
+
+
+def test_oversized_seeds_are_trimmed_and_notes_keep_their_share():
+    seed = {"strengths": [f"strength number {i} with several words" for i in range(50)], "threats": ["Rival"]}
+    out = compact_layer_input("Churn rose in March. Android users report sync failures.", seed, token_budget=100)
+    assert out.text == "Churn rose in March. Android users report sync failures."
+    assert out.seed["threats"] == ["Rival"]
+    assert 0 < len(out.seed["strengths"]) < 50
+    assert out.stats["seeds_dropped"] == 50 - len(out.seed["strengths"])
+    assert count_tokens(render_seed(out.seed)) <= 50
+
+
+def test_one_line_dump_over_budget_is_cut_not_dropped():
+    review = "Great app, fast sync | crashes on login; support slow, refund denied"
+    dump = " ".join(f"{review} #{i}" for i in range(400))
+    out = compact_layer_input(dump, {}, token_budget=150)
+    assert out.text
+    assert out.text.startswith("Great app, fast sync |")
+    assert count_tokens(out.text) <= 150
+    assert out.stats["truncated"] == 1
+
+
+def test_notes_repeating_a_trimmed_seed_are_kept():
+    seed = {"strengths": [f"Strength number {i} with several words" for i in range(80)]}
+    out = compact_layer_input("Strength number 79 with several words.", seed, token_budget=100)
+    assert "Strength number 79 with several words" not in out.seed["strengths"]
+    assert out.text == "Strength number 79 with several words."
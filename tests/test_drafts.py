@@ -0,0 +1,103 @@
+"""Speculative drafts: slots, spend caps, claims and signed sessions."""
+
+import asyncio
+import os
+import stat
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from helpers import DraftExtractor, LayerOutput, session_secret, sign_session, verify_session
+from helpers.drafts import SECRET_FILE
+
+
+def _output(text="draft"):
+    return LayerOutput(layer="Canonical", company="Imp Co", desired_outcomes=text)
+
+
+def _extract(release: asyncio.Event, text="draft"):
+    async def run():
+        await release.wait()
+        return _output(text)
+    return run
+
+
+def test_changed_text_cancels_the_previous_draft():
+    async def scenario():
+        drafts, release = DraftExtractor(), asyncio.Event()
+        assert drafts.submit("s", "c", "canonical", "k1", _extract(release)) == "started"
+        first = drafts._tasks["k1"]
+        assert drafts.submit("s", "c", "canonical", "k1", _extract(release)) == "running"
+        assert drafts.submit("s", "c", "canonical", "k2", _extract(release, "second")) == "started"
+        release.set()
+        out = await drafts.take("k2")
+        await asyncio.sleep(0)
+        return first, out, drafts.counters
+
+    first, out, counters = asyncio.run(scenario())
+    assert first.cancelled()
+    assert out.desired_outcomes == "second"
+    assert counters["cancelled"] == 1 and counters["hits"] == 1
+
+
+@pytest.mark.parametrize("caps, calls", [
+    ({"max_per_session": 2}, [("s1", "c1"), ("s1", "c2")]),
+    ({"max_per_client": 2}, [("s1", "c1"), ("s2", "c1")]),
+    ({"max_total": 2}, [("s1", "c1"), ("s2", "c2")]),
+])
+def test_each_spend_cap_applies(caps, calls):
+    async def scenario():
+        drafts, release = DraftExtractor(**caps), asyncio.Event()
+        statuses = [drafts.submit(session, client, f"layer{i}", f"k{i}", _extract(release))
+                    for i, (session, client) in enumerate(calls + calls[:1])]
+        release.set()
+        await asyncio.gather(*drafts._tasks.values())
+        return statuses, drafts.counters
+
+    statuses, counters = asyncio.run(scenario())
+    assert statuses == ["started", "started", "capped"]
+    assert counters["capped"] == 1
+
+
+def test_take_survives_a_cancelled_analysis():
+    async def scenario():
+        drafts, release = DraftExtractor(), asyncio.Event()
+        drafts.submit("s", "c", "canonical", "k1", _extract(release))
+        waiting = asyncio.create_task(drafts.take("k1"))
+        await asyncio.sleep(0)
+        # The next submit for this slot must not cancel a draft an analysis is waiting on
+        drafts.submit("s", "c", "canonical", "k2", _extract(release))
+        waiting.cancel()
+        release.set()
+        return await drafts.take("k1"), waiting
+
+    out, waiting = asyncio.run(scenario())
+    assert waiting.cancelled()
+    assert out is not None and out.desired_outcomes == "draft"
+
+
+def test_signed_sessions_verify_and_forgeries_do_not():
+    secret = b"s" * 32
+    cookie = sign_session("token", secret)
+    assert verify_session(cookie, secret) == "token"
+    assert verify_session(sign_session("token", b"other"), secret) is None
+    assert verify_session("token." + "0" * 32, secret) is None
+    assert verify_session("token", secret) is None
+    assert verify_session("", secret) is None
+
+
+def test_session_secret_is_created_once_for_concurrent_workers(tmp_path, monkeypatch):
+    monkeypatch.delenv("SESSION_SECRET", raising=False)
+    with ThreadPoolExecutor(8) as pool:
+        secrets = set(pool.map(lambda _: session_secret(tmp_path), range(32)))
+
+    assert len(secrets) == 1 and len(secrets.pop()) == 64
+    assert stat.S_IMODE(os.stat(tmp_path / SECRET_FILE).st_mode) == 0o600
+    assert [p.name for p in tmp_path.iterdir()] == [SECRET_FILE]
+
+
+def test_empty_session_secret_is_refused(tmp_path, monkeypatch):
+    monkeypatch.delenv("SESSION_SECRET", raising=False)
+    (tmp_path / SECRET_FILE).write_bytes(b"")
+    with pytest.raises(ValueError):
+        session_secret(tmp_path)
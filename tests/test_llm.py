@@ -0,0 +1,20 @@
+from helpers.llm import seed_gaps, validate_layer_output
+from helpers.models import LayerOutput, SWOTItem
+
+NOTES = "Our onboarding funnel lost a third of trial users in the first week after the redesign."
+
+
+def _output(**quadrants):
+    return LayerOutput(layer="Canonical", company="Imp Co", desired_outcomes="grow",
+                       **{dim: [SWOTItem(text=t, impact=5, sentiment=0.0) for t in items] for dim, items in quadrants.items()})
+
+
+def test_empty_seeded_quadrant_is_a_soft_signal_not_a_failure():
+    out = _output(weaknesses=["Trial users drop off after the redesign"])
+    seed = {"strengths": ["Strong brand"], "weaknesses": ["Onboarding"]}
+    assert validate_layer_output(out, NOTES, seed) is None
+    assert seed_gaps(out, seed) == ["strengths"]
+
+
+def test_all_empty_output_with_evidence_still_fails():
+    assert validate_layer_output(_output(), NOTES, {}) == "empty quadrants"
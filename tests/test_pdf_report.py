@@ -0,0 +1,51 @@
+"""On-disk PDF report cache: reuse, invalidation and lock files."""
+
+import pytest
+
+from helpers import cached_report, invalidate_report, render_report_file, report_path, rescore_runs
+from helpers import pdf_report
+
+pytest.importorskip("reportlab")
+
+
+@pytest.fixture
+def store(tmp_path, run_line, import_lines):
+    import_lines(tmp_path, [run_line("r1", "alpha feature")])
+    return tmp_path
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    calls = []
+    render_pdf = pdf_report.render_pdf
+    monkeypatch.setattr(pdf_report, "render_pdf", lambda summary: calls.append(summary.run_id) or render_pdf(summary))
+    return calls
+
+
+def _render(store):
+    return render_report_file(str(store / "r1.json"), str(report_path("r1", store)))
+
+
+def test_rendered_report_is_cached_until_invalidated(store, renders):
+    out = _render(store)
+    assert cached_report("r1", store) == report_path("r1", store)
+    assert open(out, "rb").read(5) == b"%PDF-"
+    _render(store)
+    assert renders == ["r1"]
+
+    invalidate_report("r1", store)
+    assert cached_report("r1", store) is None
+    _render(store)
+    assert renders == ["r1", "r1"]
+
+
+def test_rescore_invalidates_the_cached_report(store, renders):
+    _render(store)
+    rescore_runs(store, store / "swot_runs.csv", version="sentiment_gap", workers=1)
+    assert cached_report("r1", store) is None
+
+
+def test_no_lock_file_is_left_per_report(store, renders):
+    _render(store)
+    assert not list(report_path("r1", store).parent.glob("*.pdf.lock"))
+    assert len(list(report_path("r1", store).parent.glob(".render.*.lock"))) == 1
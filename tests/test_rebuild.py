@@ -0,0 +1,46 @@
+"""Rebuilding the search and near-duplicate indexes next to a live store."""
+
+import pytest
+
+from helpers import dedup, find_near_duplicate, rebuild_near_dup_index, rebuild_search_index, search
+from helpers import search_items
+
+ALPHA = "Alpha launch went well. Customers praise the onboarding flow and the pricing page."
+BETA = "Beta churn is rising. Support tickets mention crashes on older phones every week."
+
+
+def _search_hit(data_dir, notes, word):
+    hits = search_items(data_dir, word)["results"]
+    return hits[0]["run_id"] if hits else None
+
+
+def _near_dup_hit(data_dir, notes, word):
+    match = find_near_duplicate("canonical", "Imp Co", notes, data_dir, 0.9)
+    return match[0] if match else None
+
+
+@pytest.mark.parametrize("module, rebuild, lookup", [
+    (search, rebuild_search_index, _search_hit),
+    (dedup, rebuild_near_dup_index, _near_dup_hit),
+], ids=["search", "near_dup"])
+def test_rebuild_swaps_in_and_keeps_runs_written_meanwhile(
+    tmp_path, run_line, import_lines, monkeypatch, module, rebuild, lookup
+):
+    import_lines(tmp_path, [run_line("r1", "alpha feature", ALPHA)])
+    insert = module._insert_run
+    written = []
+
+    def insert_then_persist(conn, summary):
+        insert(conn, summary)
+        assert lookup(tmp_path, ALPHA, "alpha") == "r1"  # the live index keeps serving
+        if not written:
+            written.append(summary.run_id)
+            import_lines(tmp_path, [run_line("r2", "beta feature", BETA)])  # another worker, mid-rebuild
+
+    monkeypatch.setattr(module, "_insert_run", insert_then_persist)
+    stats = rebuild(tmp_path)
+
+    assert stats["runs"] == 2
+    assert lookup(tmp_path, ALPHA, "alpha") == "r1"
+    assert lookup(tmp_path, BETA, "beta") == "r2"
+    assert not list(tmp_path.glob("*.rebuild*"))
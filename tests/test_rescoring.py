@@ -0,0 +1,66 @@
+"""Re-scoring passes: journal lifetime and single-flight guard."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from helpers import RescoreInProgress, load_run, rescore_running, rescore_runs, reserve_rescore
+from helpers.cache import file_lock
+from helpers.rescoring import RESCORE_LOCK, _journal_path
+
+
+@pytest.fixture
+def store(tmp_path, run_line, import_lines):
+    lines = [run_line(f"r{i}", f"item {i}") for i in range(3)]
+    import_lines(tmp_path, lines)
+    return tmp_path
+
+
+def test_completed_pass_does_not_skip_the_next(store):
+    first = rescore_runs(store, store / "swot_runs.csv", version="sentiment_gap", workers=1)
+    assert first["rescored"] == 3 and first["skipped"] == 0
+    assert not _journal_path(store, "sentiment_gap").exists()
+
+    second = rescore_runs(store, store / "swot_runs.csv", version="sentiment_gap", workers=1)
+    assert second["rescored"] == 3 and second["skipped"] == 0
+    assert load_run("r0", store).scoring_version == "sentiment_gap"
+
+
+def test_concurrent_pass_is_refused(store):
+    with file_lock(store / RESCORE_LOCK):
+        with pytest.raises(RescoreInProgress):
+            rescore_runs(store, store / "swot_runs.csv", workers=1)
+
+
+def test_interrupted_pass_resumes_from_the_journal(store, monkeypatch):
+    from helpers import rescoring
+    calls = []
+    rescore_file = rescoring._rescore_file
+
+    def fail_once(path, version, promote):
+        calls.append(path)
+        if len(calls) == 1:
+            raise RuntimeError("worker died")
+        return rescore_file(path, version, promote)
+
+    monkeypatch.setattr(rescoring, "ProcessPoolExecutor", ThreadPoolExecutor)
+    monkeypatch.setattr(rescoring, "_rescore_file", fail_once)
+    first = rescore_runs(store, store / "swot_runs.csv", version="sentiment_gap", workers=1)
+    assert first == {**first, "rescored": 2, "failed": 1}
+    assert _journal_path(store, "sentiment_gap").exists()
+
+    second = rescore_runs(store, store / "swot_runs.csv", version="sentiment_gap", workers=1)
+    assert second == {**second, "rescored": 1, "skipped": 2, "failed": 0}
+    assert not _journal_path(store, "sentiment_gap").exists()
+    index = pd.read_csv(store / "swot_runs.csv")
+    assert all(load_run(r, store).priorities["ranked"][0]["priority"] == score
+               for r, score in zip(index["run_id"], index["top_priority_score"]))
+
+
+def test_reserved_pass_refuses_a_second_and_releases_when_done(store):
+    held = reserve_rescore(store)
+    with pytest.raises(RescoreInProgress):
+        reserve_rescore(store)
+    rescore_runs(store, store / "swot_runs.csv", workers=1, held=held)
+    assert not rescore_running(store)
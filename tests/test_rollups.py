@@ -0,0 +1,34 @@
+"""Per-company rollup keys and trends."""
+
+import json
+
+from helpers import company_trend, find_near_duplicate
+from helpers.rollups import company_key
+
+NOTES = "Dealers report long waits for hybrid models. Parts shortages delay repairs by weeks."
+
+
+def _line(run_id, company):
+    layer = {"company": company, "desired_outcomes": "grow"}
+    return json.dumps({
+        "run_id": run_id, "timestamp": "2025-01-01T00:00:00+00:00", "company": company, "desired_outcomes": "grow",
+        "canonical": {**layer, "layer": "Canonical", "strengths": [{"text": "brand", "impact": 7, "sentiment": 0.5}]},
+        "corpus": {**layer, "layer": "Corpus"}, "transactional": {**layer, "layer": "Transactional"},
+        "layer_inputs": {"canonical": NOTES},
+    })
+
+
+def test_company_key_is_unicode_aware_and_case_insensitive():
+    names = ["株式会社トヨタ", "ソニー", "Зенит", "Acme Inc."]
+    assert len({company_key(n) for n in names}) == len(names)
+    assert company_key("Acme Inc.") == company_key("ACME  inc") == company_key("acme-inc")
+    assert company_key("Зенит") == company_key("ЗЕНИТ")
+
+
+def test_non_latin_companies_do_not_share_rollups_or_near_dups(tmp_path, import_lines):
+    import_lines(tmp_path, [_line("r1", "株式会社トヨタ")])
+
+    assert company_trend("ソニー", tmp_path) is None
+    assert company_trend("株式会社トヨタ", tmp_path)["run_count"] == 1
+    assert find_near_duplicate("canonical", "ソニー", NOTES, tmp_path, 0.9) is None
+    assert find_near_duplicate("canonical", "株式会社トヨタ", NOTES, tmp_path, 0.9)[0] == "r1"
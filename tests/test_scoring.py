@@ -0,0 +1,66 @@
+"""Scoring model registry and Monte Carlo sensitivity."""
+
+import random
+
+import pytest
+
+from helpers import LayerOutput, SWOTItem, compute_priorities, get_scorer, sensitivity_analysis
+from helpers.scoring import DIMENSIONS
+
+
+def _legacy_priorities(canonical, corpus, transactional):
+    """compute_priorities as it was before scoring models were registered (GAP × IMPACT)."""
+    dim_results = {}
+    for dim in DIMENSIONS:
+        layer_impacts, layer_sents = {}, {}
+        for lname, lval in {"canonical": canonical, "corpus": corpus, "transactional": transactional}.items():
+            items = getattr(lval, dim)
+            layer_impacts[lname] = float(sum(i.impact for i in items) / len(items)) if items else 0.0
+            layer_sents[lname] = float(sum(i.sentiment for i in items) / len(items)) if items else 0.0
+        impacts = list(layer_impacts.values())
+        gap = float(max(impacts) - min(impacts))
+        impact_mean = float(sum(impacts) / len(impacts))
+        dim_results[dim] = {"layer_impacts": layer_impacts, "layer_sentiments": layer_sents,
+                            "gap": round(gap, 3), "impact_mean": round(impact_mean, 3),
+                            "priority": round(gap * impact_mean, 2)}
+    ranked = sorted([{"dimension": d, **v} for d, v in dim_results.items()], key=lambda x: x["priority"], reverse=True)
+    return {"by_dimension": dim_results, "ranked": ranked}
+
+
+def _random_layers(rng):
+    def layer(name):
+        return LayerOutput(layer=name, company="Imp Co", desired_outcomes="grow", **{
+            dim: [SWOTItem(text=f"{dim} {i}", impact=rng.randint(1, 10), sentiment=round(rng.uniform(-1, 1), 2))
+                  for i in range(rng.randint(0, 4))]
+            for dim in DIMENSIONS
+        })
+    return layer("Canonical"), layer("Corpus"), layer("Transactional")
+
+
+def test_v1_matches_the_legacy_formula():
+    rng = random.Random(7)
+    for _ in range(200):
+        layers = _random_layers(rng)
+        assert compute_priorities(*layers) == {**_legacy_priorities(*layers), "version": "v1"}
+
+
+def test_zero_noise_sensitivity_collapses_to_the_baseline():
+    layers = _random_layers(random.Random(3))
+    report = sensitivity_analysis(*layers, samples=200, impact_sigma=0.0, sentiment_sigma=0.0, seed=1)
+    baseline = compute_priorities(*layers)["by_dimension"]
+
+    assert report["rank_stability"] == 1.0 and report["top_stability"] == 1.0
+    for dim, detail in report["by_dimension"].items():
+        assert detail["baseline_priority"] == baseline[dim]["priority"]
+        assert detail["ci_low"] == detail["ci_high"] == detail["mean_priority"]
+        assert round(detail["mean_priority"], 2) == baseline[dim]["priority"]
+
+
+@pytest.mark.parametrize("call", [
+    lambda layers: get_scorer("v0"),
+    lambda layers: compute_priorities(*layers, model="v0"),
+    lambda layers: sensitivity_analysis(*layers, model="v0"),
+])
+def test_unknown_models_are_rejected(call):
+    with pytest.raises(ValueError):
+        call(_random_layers(random.Random(1)))
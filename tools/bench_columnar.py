@@ -0,0 +1,62 @@
+"""
+Compare memory and scoring time of pydantic runs vs the columnar ItemTable.
+
+    python tools/bench_columnar.py --data-dir swot_data --runs 20000
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from itertools import islice
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from helpers.columnar import ItemTable  # noqa: E402
+from helpers.models import RunSummary  # noqa: E402
+from helpers.persistence import iter_run_paths  # noqa: E402
+from helpers.scoring import compute_priorities  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Columnar item table benchmark.")
+    parser.add_argument("--data-dir", default="swot_data")
+    parser.add_argument("--runs", type=int, default=5000)
+    args = parser.parse_args()
+
+    paths = list(islice(iter_run_paths(Path(args.data_dir)), args.runs))
+    raw = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            raw.append(json.load(f))
+
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    runs = [RunSummary(**d) for d in raw]
+    pydantic_bytes = tracemalloc.get_traced_memory()[0] - base
+
+    base = tracemalloc.get_traced_memory()[0]
+    table = ItemTable.from_runs(runs)
+    table_bytes = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+
+    items = len(table) or 1
+    print(f"runs: {len(runs)}  items: {len(table)}")
+    print(f"pydantic RunSummary objects: {pydantic_bytes / items:8.1f} bytes/item")
+    print(f"ItemTable (traced):          {table_bytes / items:8.1f} bytes/item  (texts shared with the objects above)")
+    print(f"ItemTable (memory_report):   {json.dumps(table.memory_report())}")
+
+    start = time.perf_counter()
+    for s in runs:
+        compute_priorities(s.canonical, s.corpus, s.transactional)
+    loop_s = time.perf_counter() - start
+    start = time.perf_counter()
+    table.priorities()
+    vec_s = time.perf_counter() - start
+    print(f"scoring: compute_priorities loop {loop_s * 1000:.1f} ms, ItemTable.priorities {vec_s * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
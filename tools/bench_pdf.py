@@ -0,0 +1,96 @@
+"""
+Benchmark PDF report rendering.
+
+1. Renders `--runs` stored reports in-process and reports per-report render time.
+2. Hits GET /results/{run_id}.pdf?refresh=true on a running server at each
+   concurrency level and reports throughput and latency (cache bypassed).
+
+    python tools/bench_pdf.py --data-dir swot_data --base-url http://localhost:8000 --levels 1,4,16
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from itertools import cycle, islice
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from helpers.models import RunSummary  # noqa: E402
+from helpers.pdf_report import render_pdf  # noqa: E402
+from helpers.persistence import iter_run_paths  # noqa: E402
+
+
+def bench_render(run_paths, repeat: int) -> None:
+    timings, sizes = [], []
+    for path in run_paths:
+        with open(path, "r", encoding="utf-8") as f:
+            summary = RunSummary(**json.load(f))
+        for _ in range(repeat):
+            start = time.perf_counter()
+            pdf = render_pdf(summary)
+            timings.append(time.perf_counter() - start)
+            sizes.append(len(pdf))
+    timings.sort()
+    print(f"in-process render: {len(timings)} reports, "
+          f"mean {statistics.mean(timings) * 1000:.1f} ms, "
+          f"p95 {timings[int(0.95 * (len(timings) - 1))] * 1000:.1f} ms, "
+          f"avg size {statistics.mean(sizes) / 1024:.1f} KiB")
+
+
+async def bench_server(base_url: str, run_ids, levels, requests_per_level: int) -> None:
+    print(f"{'conc':>6}{'reqs':>7}{'rps':>9}{'p50 ms':>9}{'p95 ms':>9}{'errors':>8}")
+    for level in levels:
+        ids = list(islice(cycle(run_ids), requests_per_level))
+        latencies, errors = [], 0
+        queue: asyncio.Queue = asyncio.Queue()
+        for rid in ids:
+            queue.put_nowait(rid)
+
+        async def worker(client):
+            nonlocal errors
+            while not queue.empty():
+                rid = queue.get_nowait()
+                start = time.perf_counter()
+                resp = await client.get(f"/results/{rid}.pdf", params={"refresh": "true"})
+                latencies.append(time.perf_counter() - start)
+                if resp.status_code != 200:
+                    errors += 1
+
+        async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+            started = time.perf_counter()
+            await asyncio.gather(*[worker(client) for _ in range(level)])
+            elapsed = time.perf_counter() - started
+        latencies.sort()
+        print(f"{level:>6}{len(latencies):>7}{len(latencies) / elapsed:>9.2f}"
+              f"{latencies[len(latencies) // 2] * 1000:>9.1f}"
+              f"{latencies[int(0.95 * (len(latencies) - 1))] * 1000:>9.1f}{errors:>8}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="PDF report rendering benchmark.")
+    parser.add_argument("--data-dir", default="swot_data")
+    parser.add_argument("--runs", type=int, default=20, help="Stored runs to render.")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--base-url", default=None, help="Also benchmark a running server.")
+    parser.add_argument("--levels", default="1,2,4,8,16")
+    parser.add_argument("--requests", type=int, default=64, help="Requests per concurrency level.")
+    args = parser.parse_args()
+
+    run_paths = list(islice(iter_run_paths(Path(args.data_dir)), args.runs))
+    if not run_paths:
+        sys.exit(f"No stored runs in {args.data_dir}")
+    bench_render(run_paths, args.repeat)
+
+    if args.base_url:
+        levels = [int(x) for x in args.levels.split(",")]
+        asyncio.run(bench_server(args.base_url, [p.stem for p in run_paths], levels, args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Load-test driver for the SWOT app (pair with tools/mock_openai.py).
+
+Ramps concurrency through the given levels, keeps that many requests in flight
+against each target for `--duration` seconds, and reports throughput, latency
+percentiles and error rates per level.
+
+    python tools/loadtest.py --base-url http://localhost:8000 --levels 1,4,16,64 --duration 20
+    python tools/loadtest.py --target "GET /api/search?q=android" --levels 8,32
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections import Counter
+from typing import Any, Dict, List, Tuple
+
+import httpx
+
+ANALYZE_FORM = {
+    "company_name": "Load Test Co",
+    "desired_outcomes": "increase downloads for Bodybuilding Diet App on iOS",
+    "layer_canonical": "Premium bodybuilding diet app designed by competition professionals. "
+                       "400k+ food database, weekly macro cycling, AI chat added Dec 2024.",
+    "layer_corpus": "Crowded market: MyFitnessPal, Lose It!, Cronometer. 4.7 stars but only 23 ratings. "
+                    "68% of fitness app users churn within 30 days.",
+    "layer_transactional": "Only 23 ratings in 12 years, no Android version, aggressive discounting, "
+                           "no marketing campaigns or influencer partnerships.",
+    "strengths": "High App Store rating\nDesigned by competition professionals",
+    "weaknesses": "Only 23 ratings\nNo Android version",
+    "opportunities": "Influencer marketing\nAndroid expansion",
+    "threats": "MyFitnessPal scale\nAI feature commoditization",
+}
+
+
+def _parse_target(spec: str) -> Tuple[str, str]:
+    method, _, path = spec.partition(" ")
+    if not path:
+        method, path = "POST", spec
+    return method.upper(), path
+
+
+def _percentile(sorted_values: List[float], p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, max(0, round(p / 100 * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+async def _worker(client: httpx.AsyncClient, method: str, path: str, deadline: float,
+                  latencies: List[float], statuses: Counter, unique: bool) -> None:
+    n = 0
+    while time.perf_counter() < deadline:
+        data = None
+        if method == "POST" and path.startswith("/analyze"):
+            data = dict(ANALYZE_FORM)
+            if unique:  # defeat near-duplicate reuse so every request reaches the LLM
+                data["layer_canonical"] += f" Variant {id(latencies)}-{n}-{time.perf_counter_ns()}."
+        n += 1
+        start = time.perf_counter()
+        try:
+            resp = await client.request(method, path, data=data)
+            statuses[resp.status_code] += 1
+        except httpx.HTTPError as exc:
+            statuses[type(exc).__name__] += 1
+        latencies.append(time.perf_counter() - start)
+
+
+async def run_level(base_url: str, target: str, concurrency: int, duration: float,
+                    timeout: float, unique: bool) -> Dict[str, Any]:
+    method, path = _parse_target(target)
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        started = time.perf_counter()
+        deadline = started + duration
+        await asyncio.gather(*[
+            _worker(client, method, path, deadline, latencies, statuses, unique)
+            for _ in range(concurrency)
+        ])
+        elapsed = time.perf_counter() - started
+
+    total = sum(statuses.values())
+    ok = sum(v for k, v in statuses.items() if isinstance(k, int) and 200 <= k < 300)
+    lat = sorted(latencies)
+    return {
+        "target": target,
+        "concurrency": concurrency,
+        "requests": total,
+        "throughput_rps": round(ok / elapsed, 2) if elapsed else 0.0,
+        "error_rate": round(1 - ok / total, 4) if total else 0.0,
+        "p50_ms": round(_percentile(lat, 50) * 1000, 1),
+        "p95_ms": round(_percentile(lat, 95) * 1000, 1),
+        "p99_ms": round(_percentile(lat, 99) * 1000, 1),
+        "max_ms": round(lat[-1] * 1000, 1) if lat else 0.0,
+        "statuses": {str(k): v for k, v in statuses.items()},
+    }
+
+
+async def main_async(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    levels = [int(x) for x in args.levels.split(",")]
+    results = []
+    print(f"{'target':<28}{'conc':>6}{'reqs':>8}{'rps':>9}{'err%':>8}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for target in args.target:
+        for level in levels:
+            r = await run_level(args.base_url, target, level, args.duration, args.timeout, args.unique)
+            results.append(r)
+            print(f"{target[:27]:<28}{r['concurrency']:>6}{r['requests']:>8}{r['throughput_rps']:>9}"
+                  f"{r['error_rate'] * 100:>7.1f}%{r['p50_ms']:>9}{r['p95_ms']:>9}{r['p99_ms']:>9}")
+            if args.cooldown:
+                await asyncio.sleep(args.cooldown)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Concurrency ramp load test for the SWOT app.")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--target", action="append",
+                        help='Route to hit, e.g. "/analyze" or "GET /api/search?q=android" (repeatable).')
+    parser.add_argument("--levels", default="1,2,4,8,16,32,64")
+    parser.add_argument("--duration", type=float, default=15.0, help="Seconds per concurrency level.")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--cooldown", type=float, default=2.0)
+    parser.add_argument("--unique", action="store_true", help="Vary /analyze notes so nothing is reused.")
+    parser.add_argument("--json", dest="json_out", default=None, help="Also write results to this file.")
+    args = parser.parse_args()
+    args.target = args.target or ["/analyze"]
+
+    results = asyncio.run(main_async(args))
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
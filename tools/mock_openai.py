@@ -0,0 +1,228 @@
+"""
+Local mock of the OpenAI chat-completions API for load testing.
+
+Speaks enough of the protocol for `ChatOpenAI(...).with_structured_output(...)`:
+`response_format` json_schema / json_object and tool (function) calling.
+Answers are synthesized from the requested JSON schema.
+
+Run:
+    python tools/mock_openai.py --port 9000 --latency-median 0.8 --error-429 0.05
+    python tools/mock_openai.py --model-profile gpt-4o-mini=0.4:0.3 --model-profile gpt-4o=1.5
+    OPENAI_BASE_URL=http://localhost:9000/v1 OPENAI_API_KEY=mock uvicorn main:app
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+WORDS = (
+    "growth churn pricing android ratings reviews marketing partnerships coaches gyms ai chat "
+    "retention onboarding discovery conversion subscriptions competitors market brand trust"
+).split()
+
+
+class MockConfig:
+    latency_median: float = 0.8  # seconds, lognormal median per completion
+    latency_sigma: float = 0.4  # lognormal shape; 0 gives a fixed latency
+    per_token_ms: float = 0.0  # extra latency per completion token
+    error_429: float = 0.0  # probability of a rate-limit response
+    error_5xx: float = 0.0  # probability of a 500/502/503 response
+    retry_after: float = 1.0  # seconds advertised on 429s
+    # model -> (latency median, probability of an all-empty extraction); others use the defaults
+    model_profiles: Dict[str, Tuple[float, float]] = {}
+    seed: Optional[int] = None
+
+
+config = MockConfig()
+rng = random.Random()
+stats: Dict[str, Any] = {
+    "requests": 0, "ok": 0, "rate_limited": 0, "server_errors": 0,
+    "prompt_tokens": 0, "completion_tokens": 0, "in_flight": 0, "max_in_flight": 0,
+}
+
+app = FastAPI(title="Mock OpenAI")
+
+
+def _count_tokens(text: str) -> int:
+    # ~4 characters per token is close enough for accounting
+    return max(1, len(text) // 4)
+
+
+def _resolve(schema: Dict[str, Any], defs: Dict[str, Any]) -> Dict[str, Any]:
+    if "$ref" in schema:
+        return _resolve(defs[schema["$ref"].split("/")[-1]], defs)
+    if "anyOf" in schema:
+        options = [s for s in schema["anyOf"] if s.get("type") != "null"]
+        return _resolve(options[0] if options else {"type": "null"}, defs)
+    return schema
+
+
+def synthesize(schema: Dict[str, Any], defs: Dict[str, Any], depth: int = 0) -> Any:
+    """Produce a random value that validates against a (pydantic-style) JSON schema."""
+    schema = _resolve(schema, defs)
+    kind = schema.get("type")
+    if "enum" in schema:
+        return rng.choice(schema["enum"])
+    if kind == "object":
+        props = schema.get("properties", {})
+        return {name: synthesize(sub, defs, depth + 1) for name, sub in props.items()}
+    if kind == "array":
+        lo = schema.get("minItems", 0 if depth > 2 else 1)
+        hi = schema.get("maxItems", 4)
+        return [synthesize(schema.get("items", {}), defs, depth + 1) for _ in range(rng.randint(lo, max(lo, hi)))]
+    if kind == "integer":
+        return rng.randint(int(schema.get("minimum", 0)), int(schema.get("maximum", 10)))
+    if kind == "number":
+        return round(rng.uniform(schema.get("minimum", 0.0), schema.get("maximum", 1.0)), 2)
+    if kind == "boolean":
+        return rng.random() < 0.5
+    if kind == "null":
+        return None
+    return " ".join(rng.choices(WORDS, k=rng.randint(4, 14)))
+
+
+def _schema_from_request(body: Dict[str, Any]):
+    """Return (schema, tool_name) for the structured output the client asked for."""
+    fmt = body.get("response_format") or {}
+    if fmt.get("type") == "json_schema":
+        return fmt["json_schema"].get("schema", {}), None
+    tools = body.get("tools") or []
+    if tools:
+        fn = tools[0]["function"]
+        return fn.get("parameters", {}), fn["name"]
+    if fmt.get("type") == "json_object":
+        return {"type": "object", "properties": {}}, None
+    return None, None
+
+
+def _error(status: int, message: str, kind: str, headers: Optional[Dict[str, str]] = None) -> JSONResponse:
+    return JSONResponse({"error": {"message": message, "type": kind, "code": None}}, status_code=status, headers=headers)
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    stats["requests"] += 1
+
+    roll = rng.random()
+    if roll < config.error_429:
+        stats["rate_limited"] += 1
+        return _error(429, "Rate limit reached (mock).", "rate_limit_exceeded",
+                      {"retry-after": str(config.retry_after)})
+    if roll < config.error_429 + config.error_5xx:
+        stats["server_errors"] += 1
+        return _error(rng.choice([500, 502, 503]), "Upstream error (mock).", "server_error")
+
+    prompt_text = "".join(
+        m["content"] if isinstance(m.get("content"), str) else json.dumps(m.get("content"))
+        for m in body.get("messages", [])
+    )
+    latency_median, empty_rate = config.model_profiles.get(body.get("model"), (config.latency_median, 0.0))
+    schema, tool_name = _schema_from_request(body)
+    if schema is not None:
+        defs = schema.get("$defs", {})
+        answer = synthesize(schema, defs)
+        if isinstance(answer, dict) and rng.random() < empty_rate:
+            answer = {k: [] if isinstance(v, list) else v for k, v in answer.items()}
+        content = json.dumps(answer)
+    else:
+        content = " ".join(rng.choices(WORDS, k=40))
+
+    prompt_tokens = _count_tokens(prompt_text)
+    completion_tokens = _count_tokens(content)
+
+    delay = latency_median * (rng.lognormvariate(0, config.latency_sigma) if config.latency_sigma else 1.0)
+    delay += completion_tokens * config.per_token_ms / 1000
+    stats["in_flight"] += 1
+    stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+    try:
+        await asyncio.sleep(delay)
+    finally:
+        stats["in_flight"] -= 1
+
+    stats["ok"] += 1
+    stats["prompt_tokens"] += prompt_tokens
+    stats["completion_tokens"] += completion_tokens
+
+    if tool_name:
+        message = {
+            "role": "assistant", "content": None,
+            "tool_calls": [{
+                "id": f"call_{uuid.uuid4().hex[:24]}", "type": "function",
+                "function": {"name": tool_name, "arguments": content},
+            }],
+        }
+        finish_reason = "tool_calls"
+    else:
+        message = {"role": "assistant", "content": content, "refusal": None}
+        finish_reason = "stop"
+
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "mock"),
+        "choices": [{"index": 0, "message": message, "finish_reason": finish_reason, "logprobs": None}],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+
+
+@app.get("/v1/models")
+async def models():
+    return {"object": "list", "data": [{"id": "mock", "object": "model", "owned_by": "mock"}]}
+
+
+@app.get("/stats")
+async def get_stats():
+    return stats
+
+
+@app.post("/stats/reset")
+async def reset_stats():
+    for key in stats:
+        stats[key] = 0
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Mock OpenAI chat-completions server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency-median", type=float, default=config.latency_median)
+    parser.add_argument("--latency-sigma", type=float, default=config.latency_sigma)
+    parser.add_argument("--per-token-ms", type=float, default=config.per_token_ms)
+    parser.add_argument("--error-429", type=float, default=config.error_429)
+    parser.add_argument("--error-5xx", type=float, default=config.error_5xx)
+    parser.add_argument("--retry-after", type=float, default=config.retry_after)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--model-profile", action="append", default=[], metavar="MODEL=LATENCY[:EMPTY_RATE]",
+                        help="Per-model latency median and share of all-empty answers (repeatable)")
+    args = parser.parse_args()
+
+    for profile in args.model_profile:
+        name, _, spec = profile.partition("=")
+        latency, _, empty_rate = spec.partition(":")
+        config.model_profiles[name] = (float(latency), float(empty_rate or 0.0))
+
+    for key, value in vars(args).items():
+        if hasattr(config, key):
+            setattr(config, key, value)
+    rng.seed(args.seed)
+
+    import uvicorn
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()